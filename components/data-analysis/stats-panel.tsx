@@ -56,7 +56,7 @@ const POSTHOC: { id: CorrectionMethod; label: string }[] = [
   { id: "none", label: "Uncorrected" },
 ]
 
-const num = (v: number, d = 3) => (isFinite(v) ? v.toFixed(d) : "-")
+const num = (v: number | null, d = 3) => (v != null && isFinite(v) ? v.toFixed(d) : "-")
 
 export function useStatsPanel(table: Table, numericCols: string[]): { canvas: ReactNode; settings: ReactNode } {
   const colVals = useMemo(() => {
@@ -90,6 +90,25 @@ function ensureWorker(): Worker {
  */
 export const ENGINE_TIMEOUT_MS = 120_000
 
+/**
+ * Budgets the engine enforces on itself, sent with every compute.
+ *
+ * The time budget sits well inside `ENGINE_TIMEOUT_MS` so a runaway routine is
+ * stopped by the engine, which answers with a structured `budget-exceeded`
+ * error and keeps the warm runtime, before the deadline above has to declare
+ * the worker dead. The memory budget is checked against an estimate before any
+ * work starts, because a WebAssembly heap that runs out takes the runtime with
+ * it; 1 GB leaves headroom under the browser's wasm32 ceiling.
+ */
+export const ENGINE_TIME_BUDGET_MS = 60_000
+export const ENGINE_MEMORY_BUDGET_MB = 1024
+
+const budgeted = (payload: object) => ({
+  ...payload,
+  timeBudgetMs: ENGINE_TIME_BUDGET_MS,
+  memoryBudgetMb: ENGINE_MEMORY_BUDGET_MB,
+})
+
 function send(request: WorkerRequest, onProgress?: (p: EngineProgress) => void, warmup = false) {
   const w = ensureWorker()
   return new Promise<unknown>((resolve, reject) => {
@@ -222,7 +241,7 @@ async function computeExclusionImpact(
     const raw = (await send({
       id: `run-${++seq}`,
       type: "compute",
-      payload: bare.payload,
+      payload: budgeted(bare.payload),
     })) as { test?: TestResult | null }
     withoutExclusions = raw.test ?? null
   } catch (err) {
@@ -287,7 +306,7 @@ export async function computeAnalysis(
 
   const started = performance.now()
   const raw = (await send(
-    { id: `run-${++seq}`, type: "compute", payload: resolved.payload },
+    { id: `run-${++seq}`, type: "compute", payload: budgeted(resolved.payload) },
     options.onProgress
   )) as Omit<
     EngineResult,
@@ -314,7 +333,15 @@ export async function computeAnalysis(
     test,
     curveFit: raw.curveFit ?? null,
     survival: raw.survival ?? null,
+    power: raw.power ?? null,
+    outliers: raw.outliers ?? null,
+    roc: raw.roc ?? null,
+    distribution: raw.distribution ?? null,
+    timecourse: raw.timecourse ?? null,
+    plan: raw.plan ?? null,
     testRan: raw.testRan ?? null,
+    sufficientStats: raw.sufficientStats ?? null,
+    partial: raw.partial ?? null,
     error: raw.error ?? null,
     exclusionImpact,
     // The figure draws what the analysis actually saw: post-filter,
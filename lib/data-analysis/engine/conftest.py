@@ -0,0 +1,47 @@
+"""
+Shared fixtures for the notes9-stats engine tests.
+
+The engine is one file served to the Pyodide worker from public/, not a
+package, so it is loaded here from that path: the tests run the same source the
+browser does, on whatever numpy/scipy/statsmodels this interpreter has.
+
+    python -m pytest lib/data-analysis/engine
+"""
+from __future__ import annotations
+
+import importlib.util
+import sys
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+ROOT = Path(__file__).resolve().parents[3]
+ENGINE_SOURCE = ROOT / "public" / "data-analysis-engine" / "notes9_engine.py"
+
+
+def load_module(path: Path, name: str):
+    spec = importlib.util.spec_from_file_location(name, path)
+    module = importlib.util.module_from_spec(spec)
+    # Registered, so a worker pool can pickle the module's functions by name.
+    sys.modules[name] = module
+    spec.loader.exec_module(module)
+    return module
+
+
+@pytest.fixture(scope="session")
+def engine():
+    return load_module(ENGINE_SOURCE, "notes9_engine")
+
+
+@pytest.fixture
+def rng():
+    return np.random.default_rng(20240611)
+
+
+@pytest.fixture
+def run(engine):
+    """run() with the resolver's defaults filled in, as the worker would call it."""
+    def call(test: str, **payload):
+        return engine.run({"alpha": 0.05, "tails": "two", **payload, "test": test})
+    return call
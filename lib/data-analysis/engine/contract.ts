@@ -70,7 +70,7 @@ export function resolvePyodideBaseUrl(configured?: string): string {
 }
 
 /** Bump when the Python engine source changes in any way that can alter a number. */
-export const ENGINE_SOURCE_VERSION = "1.2.0" as const
+export const ENGINE_SOURCE_VERSION = "1.15.5" as const
 
 /**
  * The single string stamped onto every result and compared on reopen. Human
@@ -93,8 +93,31 @@ export interface AssumptionCheck {
   statistic: number | null
   pValue: number | null
   passed: boolean
+  /**
+   * False when the check needs raw values the run did not have, as on an
+   * incremental run from `priorStats`. `passed` is then false and means nothing;
+   * the verdict says why. Absent means assessable.
+   */
+  assessable?: boolean
   verdict: string
   alternative: string | null
+  /**
+   * Normal Q-Q coordinates for a normality check, thinned by the engine to a
+   * few hundred points so the chart never receives the full residual array.
+   * `n` is the number of residuals the plot summarises; the reference line is
+   * `intercept + slope * theoretical`.
+   */
+  qq?: {
+    theoretical: number[]
+    sample: number[]
+    n: number
+    intercept: number | null
+    slope: number | null
+  } | null
+  /** Normality checks: the test that ran, kept apart from the display name. */
+  method?: "Shapiro-Wilk" | "D'Agostino-Pearson"
+  /** Set when the test ran on a seeded subsample of the `of` residuals. */
+  subsample?: { size: number; of: number; seed: number } | null
 }
 
 /**
@@ -129,6 +152,9 @@ export interface EffectSize {
     | "pearson-r"
     | "spearman-rho"
     | "r-squared"
+    | "auc"
+    /** Median of the pairwise differences (or Walsh averages); the CI inverts the rank test. */
+    | "hodges-lehmann"
   value: number
   ciLow: number | null
   ciHigh: number | null
@@ -176,12 +202,16 @@ export interface DescriptiveRow {
   mean: number
   sd: number
   sem: number
-  median: number
-  q1: number
-  q3: number
-  iqr: number
-  min: number
-  max: number
+  /**
+   * Order statistics and extremes are null on a summary or incremental run:
+   * no snapshot carries them.
+   */
+  median: number | null
+  q1: number | null
+  q3: number | null
+  iqr: number | null
+  min: number | null
+  max: number | null
   cv: number | null
   geometricMean: number | null
   skewness: number | null
@@ -204,11 +234,29 @@ export interface CurveFitResult {
   aicc: number
   /** Residual standard error, Prism's Sy.x. */
   syx: number
-  /** Sampled curve for drawing, plus optional confidence band. */
+  /**
+   * Sampled curve for drawing, plus optional confidence band. The grid is
+   * adaptive, densest where the curve bends, and sized to the payload's point
+   * budget; `shaping.maxDeviation` is the largest chord-to-curve gap left.
+   */
   curve: { x: number[]; y: number[] }
+  shaping?: { budget: number; points: number; maxDeviation: number }
   confidenceBand: { x: number[]; lower: number[]; upper: number[] } | null
-  /** Back-calculated unknowns when interpolation was requested. */
-  interpolated: { label: string; signal: number; concentration: number | null; inRange: boolean }[] | null
+  /**
+   * Back-calculated unknowns when interpolation was requested, through the
+   * fitted model's own inverse. The interval carries the curve's parameter
+   * uncertainty only, not the noise of the unknown's single reading.
+   */
+  interpolated:
+    | {
+        label: string
+        signal: number
+        concentration: number | null
+        ciLow?: number | null
+        ciHigh?: number | null
+        inRange: boolean
+      }[]
+    | null
   converged: boolean
   iterations: number
 }
@@ -231,11 +279,32 @@ export interface SurvivalCurve {
   lower: number[]
   upper: number[]
   atRisk: number[]
+  /**
+   * One tick per horizontal bin of the point budget; `censoredCounts[i]` is how
+   * many censorings the tick at `censoredTimes[i]` stands for.
+   */
   censoredTimes: number[]
+  censoredCounts?: number[]
   /** Null when the curve never reaches 0.5 (median not reached). */
   median: number | null
   n: number
   events: number
+  /**
+   * What thinning the curve to the point budget cost. Every dropped step lies
+   * within `maxDeviation` of the step drawn in its place, vertically and
+   * horizontally, in survival units (time scaled to the survival span), and no
+   * tick moved further than `maxCensorShift` (time units).
+   */
+  decimation?: {
+    budget: number
+    sourcePoints: number
+    points: number
+    maxDeviation: number
+    maxBandDeviation: number
+    censorMarks: number
+    censorMarksShown: number
+    maxCensorShift: number
+  }
 }
 
 /**
@@ -283,6 +352,183 @@ export interface ExclusionImpact {
   changesSignificance: boolean
 }
 
+/**
+ * A prospective power analysis. Power is computed with the critical value the
+ * named test will use at this alpha and tails, so a planned n is planned for
+ * the p-value the engine later reports.
+ */
+export interface PowerAnalysis {
+  /** The test being planned for, e.g. "t-unpaired". */
+  design: string
+  effectSizeName: "cohens-d" | "cohens-f" | "r"
+  /** What `n` counts: "per group", "pairs" or "subjects". */
+  nUnit: string
+  alpha: number
+  tails: "two" | "greater" | "less"
+  groupCount: number | null
+  targetPower: number
+  effectSizes: number[]
+  sampleSizes: number[]
+  /** `power[i][j]` is the power at `effectSizes[i]` with `sampleSizes[j]`. */
+  power: number[][]
+  /** Smallest n reaching `targetPower`, per effect size; null when unreachable. */
+  required: { effectSize: number; n: number | null; total: number | null; achievedPower: number | null }[]
+}
+
+/**
+ * One value an outlier screen flagged. `index` is its position in the group as
+ * sent, which with the payload's group-ordered `rowIds` names the source row.
+ */
+export interface OutlierFlag {
+  index: number
+  value: number
+  /** ESD's R_i, or ROUT's |residual| / RSDR. */
+  statistic: number
+  /** ESD's critical lambda_i; null for ROUT. */
+  critical: number | null
+  /** ROUT's p before the false-discovery step; null for ESD. */
+  pValue: number | null
+}
+
+/**
+ * Candidates only. The engine never drops a value: the user decides, and the
+ * decision is recorded as an exclusion in the spec like any other.
+ */
+export interface OutlierScreen {
+  method: "esd" | "rout"
+  alpha: number | null
+  q: number | null
+  groups: {
+    group: string
+    n: number
+    flagged: OutlierFlag[]
+    /** ESD only: every step up to the bound, so near misses are visible. */
+    steps?: OutlierFlag[]
+    maxOutliers?: number
+    /** ROUT only: the robust centre and the RSDR residuals are scaled by. */
+    center?: number | null
+    scale?: number | null
+  }[]
+}
+
+/**
+ * One marker's ROC curve, thinned to the point budget. `threshold[i]` is the
+ * cut-off that gives (`fpr[i]`, `tpr[i]`), in the marker's own units; the
+ * first point, (0, 0), has no finite threshold and carries null.
+ */
+export interface RocMarker {
+  marker: string
+  auc: number
+  /** DeLong standard error; the interval is normal, clamped to [0, 1]. */
+  se: number
+  ciLow: number
+  ciHigh: number
+  fpr: number[]
+  tpr: number[]
+  threshold: (number | null)[]
+  /** The threshold maximising sensitivity + specificity - 1. */
+  youden: { threshold: number; sensitivity: number; specificity: number }
+  /**
+   * `points` thresholds were computed and `shown` drawn; every dropped point
+   * lies within `maxDeviation` of the kept point before it, in FPR and in TPR.
+   */
+  decimation: { budget: number; points: number; shown: number; maxDeviation: number }
+}
+
+export interface RocAnalysis {
+  /** Whether higher or lower scores indicate a positive. */
+  direction: "higher" | "lower"
+  positives: number
+  negatives: number
+  markers: RocMarker[]
+}
+
+/**
+ * Everything a histogram, density, violin or box plot draws, per group. Sized
+ * by the point budget, never by n, so the renderer receives no raw values.
+ */
+export interface DistributionSummary {
+  /** The rule that set the bin width; "sturges" also when FD had an IQR of 0. */
+  binRule: "fd" | "sturges"
+  /** Shared by every group, so bars compare across groups. */
+  edges: number[]
+  kernel: "gaussian"
+  bandwidthRule: "scott"
+  groups: {
+    group: string
+    n: number
+    /** Per bin of `edges`; half-open bins, the last one closed. */
+    counts: number[]
+    /** Null when the group has no spread to smooth. */
+    kde: { x: number[]; density: number[]; bandwidth: number } | null
+    /** Tukey whiskers at the furthest values within 1.5 IQR. */
+    box: {
+      q1: number
+      median: number
+      q3: number
+      whiskerLow: number
+      whiskerHigh: number
+      /** Distinct values beyond the whiskers, the most extreme first kept. */
+      outliers: number[]
+      outlierCounts: number[]
+      outlierTotal: number
+    } | null
+  }[]
+}
+
+/** Per-series time-course metrics, and the per-group summary of their AUCs. */
+export interface TimecourseAuc {
+  method: "linear" | "log-down"
+  baseline: "none" | "first" | "min" | number
+  series: {
+    label: string
+    group: string
+    /** Readings used, after nulls. Fewer than 2 leaves the areas null. */
+    points: number
+    auc: number | null
+    /** Linear area of the readings minus `baseline`, net of any dip below it. */
+    aucCorrected: number | null
+    baseline: number | null
+    peak: number | null
+    timeToPeak: number | null
+    tStart: number | null
+    tEnd: number | null
+  }[]
+  groups: { group: string; n: number; meanAuc: number; sd: number | null; se: number | null }[]
+  /**
+   * What `sd` and `se` in `groups` describe: the spread of a group's series
+   * AUCs and the standard error of its mean AUC. A series is one replicate, so
+   * a single series' AUC carries no interval of its own.
+   */
+  uncertainty: "group-mean"
+}
+
+/**
+ * What each step of an analysis plan did, in the order the steps were declared.
+ * `result` carries the fields a standalone run of that test would have filled.
+ */
+export interface AnalysisPlan {
+  steps: {
+    id: string
+    test: string
+    options: Record<string, unknown>
+    status: "ran" | "skipped" | "failed"
+    /** Why a step was skipped, or why a conditional step ran. */
+    reason: string | null
+    dependsOn: string[]
+    when: { step: string; check: string; passed: boolean } | null
+    /** The earlier step with the same test and options whose result this is. */
+    sharedWith: string | null
+    result: (Pick<
+      EngineResult,
+      | "test" | "curveFit" | "survival" | "power" | "outliers" | "roc" | "distribution"
+      | "timecourse" | "testRan" | "sufficientStats" | "partial" | "warnings"
+    >) | null
+    error: EngineError | null
+    durationMs: number
+  }[]
+}
+
 export interface EngineResult {
   /** Identity: what produced this, against what. */
   engineVersion: string
@@ -297,6 +543,18 @@ export interface EngineResult {
   curveFit: CurveFitResult | null
   /** Present only for a survival analysis. */
   survival: { groups: SurvivalCurve[] } | null
+  /** Present only for a power analysis. */
+  power?: PowerAnalysis | null
+  /** Present only for an outlier screen. */
+  outliers?: OutlierScreen | null
+  /** Present only for an ROC analysis. */
+  roc?: RocAnalysis | null
+  /** Present only for a distribution summary. */
+  distribution?: DistributionSummary | null
+  /** Present only for a time-course AUC analysis. */
+  timecourse?: TimecourseAuc | null
+  /** Present only for an analysis plan. */
+  plan?: AnalysisPlan | null
   exclusionImpact: ExclusionImpact | null
 
   /**
@@ -317,6 +575,24 @@ export interface EngineResult {
    */
   testRan: string | null
 
+  /**
+   * Exact sufficient statistics for the data this result covers, for routines
+   * that depend on the data only through them (means and moment sums per group,
+   * of paired differences, bivariate co-moments, or cell counts). Sent back as
+   * `priorStats` with only the rows added since, the engine merges them and
+   * returns the same numbers a full recompute would. Null for routines that
+   * need the raw values.
+   */
+  sufficientStats?: SufficientStats | null
+
+  /**
+   * Set when a routine that works through independent units (columns, groups)
+   * ran out of time between them: what is reported is complete for the units
+   * it covers and absent for the rest. A run that cannot be split that way
+   * fails with `budget-exceeded` instead of returning anything partial.
+   */
+  partial?: { completed: number; total: number; unit: string; stage: string } | null
+
   /**
    * Non-null exactly when the run failed, in which case `test` is null because
    * nothing was computed. See `EngineError` for why this is not a warning.
@@ -324,6 +600,30 @@ export interface EngineResult {
   error: EngineError | null
 }
 
+/** Per-sample moments as the engine merges them; `m2`-`m4` are central moment sums. */
+export interface MomentSummary {
+  n: number
+  mean: number
+  m2: number
+  /** Null when the summary came from a reported SD, which does not determine them. */
+  m3: number | null
+  m4: number | null
+  min: number | null
+  max: number | null
+  /** Count and log sum of the positive values, for the geometric mean. */
+  positive: number | null
+  logSum: number | null
+}
+
+export type SufficientStats =
+  | { kind: "groups"; groups: Record<string, MomentSummary> }
+  | { kind: "pairs"; diff: MomentSummary }
+  | {
+      kind: "xy"
+      xy: { n: number; meanX: number; meanY: number; sxx: number; syy: number; sxy: number }
+    }
+  | { kind: "table"; table: number[][] }
+
 /**
  * Why a run produced no test.
  *
@@ -337,7 +637,7 @@ export interface EngineResult {
  */
 export interface EngineError {
   /** Stable across message rewording, so callers may branch on it. */
-  code: "test-failed" | "no-routine"
+  code: "test-failed" | "no-routine" | "needs-full-data" | "budget-exceeded" | "invalid-budget"
   /** The analysis that was attempted, e.g. "nonlinear-regression". */
   test: string
   /** Shown to the user. Never a Python exception repr. */
@@ -41,19 +41,66 @@ interface PayloadBase {
   rowIds: string[]
   /** Every row post-transform, for the figure, including excluded ones. */
   plotRows: { rowId: string; values: Record<string, number | string | null>; excluded: boolean }[]
+  /**
+   * Sent with test "plan": several analyses of this payload in one run, each
+   * with its options laid over the payload. `when` runs a step only if the
+   * named assumption check on another step passed (or failed). A step `when`
+   * skipped still satisfies `after`, so the two branches can join again; a
+   * failed one does not.
+   */
+  steps?: {
+    id: string
+    test: string
+    options?: Record<string, unknown>
+    after?: string[]
+    when?: { step: string; check: string; passed: boolean }
+  }[]
+}
+
+/**
+ * Heavily tied data counted instead of expanded: each value once, with how
+ * often it occurs. Accepted wherever a column or group of observations is.
+ */
+export interface CountedValues {
+  values: number[]
+  counts: number[]
 }
 
 export type EnginePayload = PayloadBase &
   (
-    | { shape: "columns"; columns: Record<string, (number | null)[]> }
-    | { shape: "groups"; groups: Record<string, number[]>; referenceLevel: string | null; postHoc: string; equalVariance: boolean }
+    | { shape: "columns"; columns: Record<string, (number | null)[] | CountedValues> }
+    | { shape: "groups"; groups: Record<string, number[] | CountedValues>; referenceLevel: string | null; postHoc: string; equalVariance: boolean }
+    /** Reported n, mean and SD per group; t-tests and one-way ANOVA only. */
+    | { shape: "summary"; summaries: Record<string, { n: number; mean: number; sd: number }>; referenceLevel: string | null; postHoc: string; equalVariance: boolean }
     | { shape: "pairs"; pairs: [number, number][]; labels: [string, string] }
     | { shape: "matrix"; matrix: number[][]; subjects: string[]; conditions: string[] }
     | { shape: "long"; long: { y: number; f1: string; f2?: string; subject?: string }[]; interaction: boolean }
     | { shape: "xy"; x: number[]; y: number[]; forceIntercept: boolean }
     | { shape: "contingency"; table: number[][]; rowLevels: string[]; colLevels: string[] }
     | { shape: "curve"; x: number[]; y: number[]; model: string; weighting: string; sharedParameters: string[]; confidenceBands: boolean; unknowns: { label: string; signal: number }[] }
-    | { shape: "survival"; durations: number[]; events: number[]; groups: string[] | null }
+    | {
+        shape: "survival"
+        durations: number[]
+        events: number[]
+        groups: string[] | null
+        /** Cox regression only: numeric covariates, one value per subject. */
+        covariates?: Record<string, (number | null)[]>
+        ties?: "efron" | "breslow"
+        referenceLevel?: string | null
+      }
+    | {
+        shape: "timecourse"
+        /** One row per replicate series; null where a reading is missing. */
+        matrix: (number | null)[][]
+        /** Shared by every series, or one axis per series when ragged. */
+        times: number[] | number[][]
+        seriesLabels: string[]
+        seriesGroups: string[] | null
+        method: "linear" | "log-down"
+        baseline: "none" | "first" | "min" | number
+        compareWith: "t-unpaired" | "t-welch" | "mann-whitney" | "anova-one-way" | "kruskal-wallis" | null
+      }
+    | { shape: "roc"; markers: Record<string, (number | null)[]>; outcome: (0 | 1 | null)[]; direction: "higher" | "lower" }
   )
 
 /* ── Outcome ───────────────────────────────────────────────────────────────*/
@@ -0,0 +1,79 @@
+"""
+Budgets: a budget that is not a positive number is an error before anything
+runs, memory is refused up front from the estimate, and time stops a routine
+at its next checkpoint or, for independent units, between them.
+"""
+import numpy as np
+import pytest
+
+
+@pytest.mark.parametrize("key, value", [
+    ("timeBudgetMs", "soon"), ("timeBudgetMs", 0), ("timeBudgetMs", -5), ("timeBudgetMs", True),
+    ("timeBudgetMs", [1000]), ("memoryBudgetMb", "lots"), ("memoryBudgetMb", float("nan")),
+    ("memoryBudgetMb", float("inf")),
+])
+def test_invalid_budget_is_an_error_not_an_exception(run, key, value):
+    out = run("t-welch", shape="groups", groups={"a": [1, 2, 3], "b": [2, 3, 5]}, **{key: value})
+    assert out["test"] is None
+    assert out["error"]["code"] == "invalid-budget" and out["error"]["test"] == "t-welch"
+    assert key in out["error"]["detail"]
+
+
+def test_numeric_strings_and_null_are_accepted(run):
+    out = run("t-welch", shape="groups", groups={"a": [1, 2, 3], "b": [2, 3, 5]},
+              timeBudgetMs="5000", memoryBudgetMb=None)
+    assert out["error"] is None and out["test"]["pValue"] is not None
+
+
+def test_memory_budget_refuses_before_starting(run, rng):
+    x = rng.normal(size=200_000).tolist()
+    out = run("kaplan-meier", shape="survival", durations=x, events=[1] * len(x), groups=None,
+              memoryBudgetMb=1)
+    assert out["error"]["code"] == "budget-exceeded" and out["survival"] is None
+    # Durations and events, at Kaplan-Meier's 12 working float64 copies each.
+    assert out["error"]["detail"] == f"memory: 400000 input values, estimated {400_000 * 8 * 12 / 2**20:.1f} MB"
+
+
+@pytest.mark.parametrize("budget", [{"memoryBudgetMb": 1}, {"timeBudgetMs": "soon"}])
+def test_a_refused_run_describes_nothing(engine, run, rng, monkeypatch, budget):
+    described = []
+    monkeypatch.setattr(engine, "describe_column", lambda *a: described.append(a[0]))
+    groups = {g: rng.normal(size=200_000).tolist() for g in "ab"}
+    out = run("t-welch", shape="groups", groups=groups, **budget)
+    assert out["error"]["code"] in ("budget-exceeded", "invalid-budget")
+    assert out["descriptives"] == [] and described == []
+
+
+def test_descriptives_are_checkpointed(engine, run, monkeypatch):
+    monkeypatch.setattr(engine.time, "monotonic", lambda: 1e12 if engine._deadline else 0.0)
+    out = run("t-welch", shape="groups", groups={"a": [1, 2, 3], "b": [2, 3, 5]}, timeBudgetMs=1000)
+    assert out["error"]["code"] == "budget-exceeded" and "descriptives" in out["error"]["detail"]
+
+
+def test_time_budget_stops_at_a_checkpoint(engine, run, rng, monkeypatch):
+    # A clock that has always already run out: the first checkpoint stops the fit.
+    monkeypatch.setattr(engine.time, "monotonic", lambda: 1e12 if engine._deadline else 0.0)
+    x = np.repeat(10.0 ** np.linspace(-3, 2, 11), 3)
+    y = 5 + 95 / (1 + 10 ** ((-0.5 - np.log10(x)) * 1.2)) + rng.normal(0, 2, x.size)
+    out = run("nonlinear-regression", shape="curve", x=x.tolist(), y=y.tolist(), model="4pl",
+              timeBudgetMs=1000)
+    assert out["curveFit"] is None and out["error"]["code"] == "budget-exceeded"
+    assert out["error"]["detail"].startswith("time: stopped at")
+    assert engine._deadline is None
+
+
+def test_time_budget_between_units_returns_what_finished(engine, run, rng, monkeypatch):
+    calls = {"n": 0}
+
+    def checkpoint(stage):
+        if stage == "descriptives":
+            return
+        calls["n"] += 1
+        if calls["n"] > 1:
+            raise engine._BudgetExceeded(stage)
+    monkeypatch.setattr(engine, "_checkpoint", checkpoint)
+    groups = {g: rng.normal(size=50).tolist() for g in "abc"}
+    out = run("outliers", shape="groups", method="esd", groups=groups, maxOutliers=3, timeBudgetMs=1000)
+    assert out["error"] is None
+    assert out["partial"]["completed"] == 1 and out["partial"]["total"] == 3
+    assert [g["group"] for g in out["outliers"]["groups"]] == ["a"]
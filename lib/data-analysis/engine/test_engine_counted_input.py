@@ -0,0 +1,86 @@
+"""
+Counted input ({"values": [...], "counts": [...]}): every routine gives the
+answer it gives on the expanded observations, whether it reads the counts
+natively (descriptives, the rank tests, distributions) or expands them.
+"""
+import numpy as np
+import pytest
+
+
+def _likert(rng, n, p):
+    """A heavily tied sample and its counted form, with a duplicate value and a zero count."""
+    x = rng.choice(np.arange(1, 8), size=n, p=p).astype(float)
+    v, c = np.unique(x, return_counts=True)
+    c[0] -= 1
+    return x, {"values": v.tolist() + [float(v[0]), 99.0], "counts": c.tolist() + [1, 0]}
+
+
+def _close(a, b, path=""):
+    if isinstance(a, dict):
+        assert a.keys() == b.keys(), path
+        for k in a:
+            if k == "durationMs":
+                continue
+            _close(a[k], b[k], f"{path}.{k}")
+    elif isinstance(a, list):
+        assert len(a) == len(b), path
+        for i, (x, y) in enumerate(zip(a, b)):
+            _close(x, y, f"{path}[{i}]")
+    elif isinstance(a, float) and b is not None:
+        assert np.isclose(a, b, rtol=1e-9, atol=1e-12), path
+    else:
+        assert a == b, path
+
+
+P1 = [0.05, 0.1, 0.2, 0.3, 0.2, 0.1, 0.05]
+P2 = [0.02, 0.05, 0.1, 0.2, 0.3, 0.2, 0.13]
+
+
+@pytest.mark.parametrize("test, extra", [
+    ("descriptives", {}), ("mann-whitney", {}), ("kruskal-wallis", {}), ("t-welch", {}),
+    ("anova-one-way", {"postHoc": "tukey"}),
+])
+def test_counted_equals_expanded(run, rng, test, extra):
+    k = 3 if test in ("kruskal-wallis", "anova-one-way") else 2
+    expanded, counted = {}, {}
+    for i in range(k):
+        x, c = _likert(rng, 300 + 40 * i, P1 if i % 2 == 0 else P2)
+        expanded[f"g{i}"], counted[f"g{i}"] = x.tolist(), c
+    a = run(test, shape="groups", groups=expanded, **extra)
+    b = run(test, shape="groups", groups=counted, **extra)
+    assert a["error"] is None and b["error"] is None
+    _close(a, b)
+
+
+def test_distribution_counted_equals_expanded(run, rng):
+    x, c = _likert(rng, 5000, P1)
+    a = run("distribution", shape="groups", groups={"g": x.tolist()})
+    b = run("distribution", shape="groups", groups={"g": c})
+    _close(a["distribution"], b["distribution"])
+
+
+def test_hodges_lehmann_on_counts_equals_expanded(run, rng):
+    x, cx = _likert(rng, 200, P1)
+    y, cy = _likert(rng, 150, P2)
+    a = run("mann-whitney", shape="groups", groups={"x": x.tolist(), "y": y.tolist()})
+    b = run("mann-whitney", shape="groups", groups={"x": cx, "y": cy})
+    shift = lambda out: [e for e in out["test"]["effectSizes"] if e["name"] == "hodges-lehmann"][0]
+    assert shift(a) == shift(b)
+
+
+@pytest.mark.parametrize("counts, message", [
+    ([1, 2], "3 values but 2 counts"), ([1, 2.5, 1], "whole number"), ([1, -1, 1], "whole number"),
+])
+def test_malformed_counts_are_errors(run, counts, message):
+    out = run("mann-whitney", shape="groups",
+              groups={"a": {"values": [1, 2, 3], "counts": counts}, "b": [1, 2, 3]})
+    assert out["test"] is None and out["error"]["code"] == "test-failed"
+    assert message in out["error"]["detail"]
+
+
+def test_memory_estimate_counts_what_each_routine_holds(engine, rng):
+    counted = {"values": [1.0, 2.0], "counts": [500_000, 500_000]}
+    native = engine._estimate_bytes("mann-whitney", {"shape": "groups", "groups": {"a": counted}})
+    expanded = engine._estimate_bytes("t-welch", {"shape": "groups", "groups": {"a": counted}})
+    # Mann-Whitney holds two distinct values; Welch's t expands a million.
+    assert native < 1e4 < 1e6 < expanded
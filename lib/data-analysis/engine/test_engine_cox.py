@@ -0,0 +1,65 @@
+"""
+Cox regression against statsmodels' PHReg, Breslow and Efron ties, with groups
+entered against the reference level the payload names.
+"""
+import numpy as np
+import pytest
+from statsmodels.duration.hazard_regression import PHReg
+
+
+def _cohort(rng, n=300):
+    group = rng.choice(["ctrl", "low", "high"], size=n)
+    age = rng.normal(60, 8, size=n)
+    rate = np.exp(0.03 * (age - 60) + np.select([group == "low", group == "high"], [0.4, 0.9], 0.0))
+    # Rounded to whole days, so event times tie.
+    t = np.ceil(rng.exponential(30 / rate))
+    event = (rng.random(n) < 0.75).astype(int)
+    return t, event, group, age
+
+
+def _fit(run, t, event, group, age, **payload):
+    return run("cox-regression", shape="survival", durations=t.tolist(), events=event.tolist(),
+               groups=group.tolist(), covariates={"age": age.tolist()}, **payload)
+
+
+@pytest.mark.parametrize("ties", ["efron", "breslow"])
+def test_matches_phreg(run, rng, ties):
+    t, event, group, age = _cohort(rng)
+    out = _fit(run, t, event, group, age, ties=ties, referenceLevel="ctrl")
+    X = np.column_stack([group == "high", group == "low", age]).astype(float)
+    ref = PHReg(t, X, status=event, ties=ties).fit()
+    terms = out["test"]["terms"]
+    assert [r["term"] for r in terms] == ["high vs ctrl", "low vs ctrl", "age"]
+    np.testing.assert_allclose(np.log([r["estimate"] for r in terms]), ref.params, rtol=1e-6)
+    np.testing.assert_allclose([r["pValue"] for r in terms], ref.pvalues, rtol=1e-5)
+    lo = np.exp(ref.params - 1.959963984540054 * ref.bse)
+    np.testing.assert_allclose([r["ciLow"] for r in terms], lo, rtol=1e-6)
+    null = PHReg(t, X, status=event, ties=ties).loglike(np.zeros(3))
+    assert np.isclose(out["test"]["statistic"], 2 * (ref.llf - null), rtol=1e-7)
+
+
+@pytest.mark.parametrize("ref_level, first", [(None, "high"), ("low", "ctrl"), (2, "1")])
+def test_reference_level_is_matched_as_a_label(run, rng, ref_level, first):
+    t, event, group, age = _cohort(rng, 120)
+    if ref_level == 2:
+        group = np.select([group == "ctrl", group == "low"], ["1", "2"], "3")
+    out = _fit(run, t, event, group, age, referenceLevel=ref_level)
+    want = ref_level if ref_level is not None else "ctrl"
+    assert out["test"]["terms"][0]["term"] == f"{first} vs {want}"
+
+
+def test_unknown_reference_level_is_an_error(run, rng):
+    t, event, group, age = _cohort(rng, 60)
+    out = _fit(run, t, event, group, age, referenceLevel="placebo")
+    assert out["test"] is None and out["error"]["code"] == "test-failed"
+    assert "'placebo' is not one of the groups: ctrl, high, low" in out["error"]["detail"]
+
+
+def test_incomplete_subjects_are_dropped_with_a_warning(run, rng):
+    t, event, group, age = _cohort(rng, 80)
+    ages = age.tolist()
+    ages[3] = None
+    out = run("cox-regression", shape="survival", durations=t.tolist(), events=event.tolist(),
+              groups=group.tolist(), covariates={"age": ages})
+    assert out["test"]["groupSizes"]["subjects"] == 79
+    assert any("1 subject(s)" in w for w in out["warnings"])
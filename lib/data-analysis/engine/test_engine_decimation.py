@@ -0,0 +1,98 @@
+"""
+Curves thinned to the point budget: the kept points are the reference curve's
+own, and every dropped point lies within the reported deviation of the point
+drawn in its place, across as well as down. A fitted curve's grid spends its
+points where the chord misses the curve most.
+"""
+import numpy as np
+from statsmodels.duration.survfunc import SurvfuncRight
+
+
+def _drawn(kept_x, x):
+    """For each source point, the index of the kept point drawn in its place."""
+    return np.searchsorted(kept_x, x, side="right") - 1
+
+
+def test_kaplan_meier_points_and_deviation(run, rng):
+    dur = rng.exponential(10, 5000)
+    ev = (rng.random(5000) < 0.7).astype(float)
+    curve = run("kaplan-meier", shape="survival", durations=dur.tolist(), events=ev.tolist(),
+                groups=None)["survival"]["groups"][0]
+    ref = SurvfuncRight(dur, ev)
+    t = np.r_[0.0, ref.surv_times]
+    s = np.r_[1.0, ref.surv_prob]
+
+    kept = np.searchsorted(t, curve["time"])
+    np.testing.assert_array_equal(t[kept], curve["time"])
+    np.testing.assert_allclose(curve["survival"], s[kept], rtol=1e-12)
+    assert len(curve["time"]) <= curve["decimation"]["budget"]
+
+    at = _drawn(np.asarray(curve["time"]), t)
+    down = np.abs(s - s[kept][at])
+    across = np.abs(t - t[kept][at]) * (np.ptp(s) / np.ptp(t))
+    dev = curve["decimation"]["maxDeviation"]
+    assert np.max(down) <= dev + 1e-12 and np.max(across) <= dev + 1e-12
+    assert np.isclose(max(down.max(), across.max()), dev)
+    assert curve["median"] == ref.quantile(0.5)
+
+
+def test_roc_decimation_bounds_both_axes(run, rng):
+    y = (rng.random(3000) < 0.3).astype(int)
+    score = rng.normal(size=3000) + y
+    marker = run("roc", shape="roc", markers={"m": score.tolist()}, outcome=y.tolist(),
+                 direction="higher")["roc"]["markers"][0]
+    # The full empirical curve, one point per distinct threshold.
+    thr = np.unique(score)[::-1]
+    tpr = np.r_[0.0, [(score[y == 1] >= t).mean() for t in thr]]
+    fpr = np.r_[0.0, [(score[y == 0] >= t).mean() for t in thr]]
+
+    shown_f, shown_t = np.asarray(marker["fpr"]), np.asarray(marker["tpr"])
+    assert shown_f.size <= marker["decimation"]["budget"]
+    # Kept points are points of the full curve, which has no repeated point.
+    pos = np.flatnonzero(np.isin(fpr + 1j * tpr, shown_f + 1j * shown_t))
+    assert pos.size == shown_f.size
+    dev = marker["decimation"]["maxDeviation"]
+    # Every source point is within dev of the kept point at or before it.
+    drawn = np.maximum.accumulate(np.where(np.isin(np.arange(fpr.size), pos), np.arange(fpr.size), 0))
+    assert np.max(np.abs(fpr - fpr[drawn])) <= dev + 1e-12
+    assert np.max(np.abs(tpr - tpr[drawn])) <= dev + 1e-12
+
+
+def test_step_error_counts_horizontal_runs(engine):
+    # One long flat run: vertically nothing is lost, horizontally the whole axis.
+    values = np.array([1.0, 1.0, 1.0, 0.0])
+    x = np.array([0.0, 0.5, 1.0, 1.0])
+    idx = np.array([0, 3])
+    assert engine._step_error(values, idx) == 0.0
+    assert engine._step_error(values, idx, x) == 1.0
+
+
+def test_short_curves_are_not_thinned(run, rng):
+    dur = rng.exponential(10, 50)
+    curve = run("kaplan-meier", shape="survival", durations=dur.tolist(), events=[1] * 50,
+                groups=None)["survival"]["groups"][0]
+    assert len(curve["time"]) == 51 and curve["decimation"]["maxDeviation"] == 0.0
+
+
+def _sigmoid(x):
+    return 1 / (1 + np.exp(-4 * x))
+
+
+def test_fitted_curve_grid_is_densest_where_it_bends(engine):
+    x, y, dev = engine._adaptive_grid(_sigmoid, -10.0, 10.0, 200)
+    assert x.size == 200 and np.all(np.diff(x) > 0)
+    np.testing.assert_array_equal(y, _sigmoid(x))
+    # The reported deviation is the largest chord-to-curve gap left on the grid.
+    mid = (x[:-1] + x[1:]) / 2
+    assert dev == np.max(np.abs(_sigmoid(mid) - (y[:-1] + y[1:]) / 2))
+    gaps = np.diff(x)
+    assert np.median(gaps[np.abs(mid) < 1]) * 4 < np.median(gaps[np.abs(mid) > 5])
+    # Better than the even grid it replaces.
+    even = np.linspace(-10, 10, 200)
+    even_mid = (even[:-1] + even[1:]) / 2
+    assert dev < np.max(np.abs(_sigmoid(even_mid) - (_sigmoid(even[:-1]) + _sigmoid(even[1:])) / 2)) / 2
+
+
+def test_fitted_curve_grid_stops_when_chords_are_exact(engine):
+    x, y, dev = engine._adaptive_grid(lambda g: 3 * g + 1, 0.0, 1.0, 200)
+    assert x.size == 17 and dev == 0.0
@@ -0,0 +1,78 @@
+"""
+Distribution plots: bins are np.histogram's on np.histogram_bin_edges' edges,
+the FFT density is gaussian_kde's to within the binning error, and the box is
+np.percentile's quartiles with Tukey whiskers.
+"""
+import numpy as np
+import pytest
+from scipy import stats
+
+
+def _dist(run, groups, **payload):
+    return run("distribution", shape="groups", groups=groups, **payload)
+
+
+@pytest.mark.parametrize("rule", ["fd", "sturges"])
+def test_histogram_matches_numpy(run, rng, rule):
+    a, b = rng.gamma(3, size=2000), rng.normal(6, 2, size=1500)
+    out = _dist(run, {"a": a.tolist(), "b": b.tolist()}, binRule=rule)["distribution"]
+    pooled = np.r_[a, b]
+    np.testing.assert_allclose(out["edges"], np.histogram_bin_edges(pooled, bins=rule), rtol=1e-12)
+    for g, x in zip(out["groups"], (a, b)):
+        assert g["counts"] == np.histogram(x, bins=np.asarray(out["edges"]))[0].tolist()
+
+
+def test_bins_are_capped_at_the_point_budget(run, rng):
+    x = rng.standard_cauchy(5000)
+    out = _dist(run, {"a": x.tolist()}, pointBudget=50)
+    edges = out["distribution"]["edges"]
+    assert len(edges) == 51
+    np.testing.assert_allclose(edges, np.linspace(x.min(), x.max(), 51))
+    assert out["distribution"]["groups"][0]["counts"] == np.histogram(x, bins=np.asarray(edges))[0].tolist()
+    assert any("50 are drawn" in w for w in out["warnings"])
+
+
+def test_zero_iqr_falls_back_to_sturges(run):
+    x = [5.0] * 90 + [1.0, 2.0, 9.0, 12.0]
+    out = _dist(run, {"a": x}, binRule="fd")
+    assert out["distribution"]["binRule"] == "sturges"
+    np.testing.assert_allclose(out["distribution"]["edges"], np.histogram_bin_edges(x, bins="sturges"))
+    assert any("Sturges" in w for w in out["warnings"])
+
+
+def test_density_matches_gaussian_kde(run, rng):
+    x = np.r_[rng.normal(0, 1, 3000), rng.normal(4, 0.5, 1000)]
+    kde = _dist(run, {"a": x.tolist()})["distribution"]["groups"][0]["kde"]
+    ref = stats.gaussian_kde(x)
+    assert np.isclose(kde["bandwidth"], ref.factor * x.std(ddof=1), rtol=1e-12)
+    want = ref(np.asarray(kde["x"]))
+    np.testing.assert_allclose(kde["density"], want, atol=1e-4 * want.max())
+    # It integrates to one over the padded range.
+    assert np.isclose(np.trapezoid(kde["density"], kde["x"]), 1.0, atol=1e-3)
+
+
+def test_box_quartiles_whiskers_and_outliers(run, rng):
+    x = np.r_[rng.normal(size=500), [8.0, 8.0, -7.0, 9.5]]
+    box = _dist(run, {"a": x.tolist()}, pointBudget=8)["distribution"]["groups"][0]["box"]
+    q1, med, q3 = np.percentile(x, [25, 50, 75])
+    assert np.allclose([box["q1"], box["median"], box["q3"]], [q1, med, q3], rtol=1e-12)
+    inside = x[(x >= q1 - 1.5 * (q3 - q1)) & (x <= q3 + 1.5 * (q3 - q1))]
+    assert (box["whiskerLow"], box["whiskerHigh"]) == (inside.min(), inside.max())
+    beyond = x[(x < inside.min()) | (x > inside.max())]
+    assert box["outlierTotal"] == beyond.size
+    # One entry per distinct value with its count, the most extreme first kept.
+    assert dict(zip(box["outliers"], box["outlierCounts"]))[8.0] == 2
+    assert {-7.0, 8.0, 9.5} <= set(box["outliers"]) and len(box["outliers"]) <= 8
+
+
+def test_empty_and_constant_groups(run):
+    out = _dist(run, {"a": [2.0, 2.0, 2.0], "b": []})["distribution"]
+    assert out["edges"] == [1.5, 2.5]
+    a, b = out["groups"]
+    assert a["counts"] == [3] and a["kde"] is None
+    assert b["n"] == 0 and b["counts"] == [0] and b["box"] is None
+
+
+def test_no_values_is_an_error(run):
+    out = _dist(run, {"a": [None, "x"]})
+    assert out["distribution"] is None and out["error"]["code"] == "test-failed"
@@ -0,0 +1,64 @@
+"""
+Unknowns read back off a fitted 4PL/5PL: the concentration is the root of the
+fitted curve at the signal, and its interval is the delta method through that
+root, checked here by the implicit-function theorem rather than by the
+engine's own closed-form inverse.
+"""
+import numpy as np
+import pytest
+from scipy import optimize, stats
+
+
+def _standard(rng, model):
+    x = np.repeat(10.0 ** np.linspace(-3, 2, 11), 3)
+    lx = np.log10(x)
+    if model == "5pl":
+        y = 5 + 95 / (1 + 10 ** ((-0.5 - lx) * 1.2)) ** 0.6
+    else:
+        y = 5 + 95 / (1 + 10 ** ((-0.5 - lx) * 1.2))
+    return x, y + rng.normal(0, 2.0, x.size)
+
+
+@pytest.mark.parametrize("model", ["4pl", "5pl"])
+def test_unknowns_are_roots_of_the_fitted_curve(engine, run, rng, model):
+    x, y = _standard(rng, model)
+    unknowns = [{"label": f"u{i}", "signal": s} for i, s in enumerate([20.0, 50.0, 80.0, 99.0, 200.0])]
+    fit = run("nonlinear-regression", shape="curve", x=x.tolist(), y=y.tolist(), model=model,
+              unknowns=unknowns)["curveFit"]
+    func = engine._five_pl if model == "5pl" else engine._four_pl
+    names = ["bottom", "top", "logEC50", "hillSlope", "asymmetry"][: 5 if model == "5pl" else 4]
+    popt = np.array([fit["parameters"][n]["value"] for n in names])
+
+    # Same fit as scipy's, from the same start.
+    lx = np.log10(x)
+    p0 = [y.min(), y.max(), np.median(lx), 1.0] + ([1.0] if model == "5pl" else [])
+    ref, pcov = optimize.curve_fit(func, lx, y, p0=p0, maxfev=20000)
+    np.testing.assert_allclose(popt, ref, rtol=1e-10)
+
+    tcrit = stats.t.ppf(0.975, x.size - popt.size)
+    for u, got in zip(unknowns, fit["interpolated"]):
+        g = lambda t: func(t, *popt) - u["signal"]
+        if u["signal"] >= popt[1]:
+            # Beyond the top asymptote: no concentration gives this signal.
+            assert got["concentration"] is None
+            assert got["inRange"] is False
+            continue
+        root = optimize.brentq(g, -12, 12, xtol=1e-14)
+        assert np.isclose(np.log10(got["concentration"]), root, atol=1e-9)
+        # d(root)/d(theta) = -(df/dtheta) / (df/dx), at the root.
+        h = 1e-7
+        dfdx = (func(root + h, *popt) - func(root - h, *popt)) / (2 * h)
+        dfdp = np.array([(func(root, *(popt + h * e)) - func(root, *(popt - h * e))) / (2 * h)
+                         for e in np.eye(popt.size)])
+        grad = -dfdp / dfdx
+        se = np.sqrt(grad @ pcov @ grad)
+        np.testing.assert_allclose(np.log10([got["ciLow"], got["ciHigh"]]),
+                                   [root - tcrit * se, root + tcrit * se], rtol=0, atol=1e-5)
+
+
+def test_out_of_range_unknowns_warn(run, rng):
+    x, y = _standard(rng, "4pl")
+    out = run("nonlinear-regression", shape="curve", x=x.tolist(), y=y.tolist(), model="4pl",
+              unknowns=[{"label": "low", "signal": float(y.min()) - 1}, {"label": "mid", "signal": 50.0}])
+    assert [u["inRange"] for u in out["curveFit"]["interpolated"]] == [False, True]
+    assert any("outside the standard range" in w for w in out["warnings"])
@@ -0,0 +1,110 @@
+"""
+Hodges-Lehmann shifts against the sets they are defined on, built in full: the
+median of every pairwise difference (Mann-Whitney) or Walsh average (Wilcoxon),
+and the interval's ends as order statistics of that set at R's qwilcox and
+qsignrank ranks, or the normal approximation's with ties.
+"""
+import math
+
+import numpy as np
+import pytest
+from scipy import stats
+
+
+def _shift(out):
+    return next(e for e in out["test"]["effectSizes"] if e["name"] == "hodges-lehmann")
+
+
+def _q_rank_sum(n1, n2, p):
+    """qwilcox: the smallest U whose lower tail reaches p, by counting arrangements."""
+    # f(i, j, u): arrangements of i x's among i + j with U = u.
+    table = {(0, j): np.eye(1, n1 * n2 + 1, 0)[0] for j in range(n2 + 1)}
+    for i in range(1, n1 + 1):
+        table[(i, 0)] = np.eye(1, n1 * n2 + 1, 0)[0]
+        for j in range(1, n2 + 1):
+            # The largest value is an x (beating all j y's) or a y.
+            table[(i, j)] = np.roll(table[(i - 1, j)], j) + table[(i, j - 1)]
+    counts = table[(n1, n2)]
+    return int(np.argmax(np.cumsum(counts) / counts.sum() >= p))
+
+
+def _q_signed_rank(n, p):
+    """qsignrank: the smallest V whose lower tail reaches p, over the 2^n sign patterns."""
+    counts = np.zeros(n * (n + 1) // 2 + 1)
+    counts[0] = 1
+    for k in range(1, n + 1):
+        counts = counts + np.roll(counts, k)
+    return int(np.argmax(np.cumsum(counts) / counts.sum() >= p))
+
+
+def _median_and_ends(values, lower):
+    s = np.sort(values)
+    return np.median(s), s[lower - 1], s[s.size - lower]
+
+
+def _normal_lower(total, sd, alpha=0.05):
+    return max(int(math.floor(total / 2 - stats.norm.ppf(1 - alpha / 2) * sd + 0.5)), 1)
+
+
+def test_critical_values_are_r_s():
+    assert _q_rank_sum(10, 10, 0.025) == 24
+    assert _q_signed_rank(10, 0.025) == 9
+
+
+@pytest.mark.parametrize("n1, n2", [(10, 10), (7, 13), (30, 25)])
+def test_exact_shift_is_the_median_of_pairwise_differences(run, rng, n1, n2):
+    x, y = rng.normal(1, 1, n1), rng.normal(0, 1.5, n2)
+    out = run("mann-whitney", shape="groups", groups={"x": x.tolist(), "y": y.tolist()})
+    lower = max(_q_rank_sum(n1, n2, 0.025), 1)
+    mid, lo, hi = _median_and_ends((x[:, None] - y[None, :]).ravel(), lower)
+    hl = _shift(out)
+    assert np.isclose(hl["value"], mid, rtol=1e-12)
+    assert (hl["ciLow"], hl["ciHigh"]) == (lo, hi)
+    assert "exact)." in out["test"]["reportSentence"]
+
+
+@pytest.mark.parametrize("n", [10, 17, 40])
+def test_exact_shift_is_the_median_of_walsh_averages(run, rng, n):
+    y = rng.normal(size=n)
+    x = y + rng.normal(0.5, 1, n)
+    out = run("wilcoxon-signed-rank", shape="pairs", pairs=np.c_[x, y].tolist())
+    d = x - y
+    i, j = np.triu_indices(n)
+    lower = max(_q_signed_rank(n, 0.025), 1)
+    mid, lo, hi = _median_and_ends((d[i] + d[j]) / 2, lower)
+    hl = _shift(out)
+    assert np.isclose(hl["value"], mid, rtol=1e-12)
+    assert np.isclose(hl["ciLow"], lo, rtol=1e-12) and np.isclose(hl["ciHigh"], hi, rtol=1e-12)
+
+
+def test_tied_shift_uses_the_tie_corrected_normal_interval(run, rng):
+    x, y = rng.integers(0, 12, 300).astype(float), rng.integers(2, 14, 260).astype(float)
+    out = run("mann-whitney", shape="groups", groups={"x": x.tolist(), "y": y.tolist()})
+    n1, n2 = x.size, y.size
+    n = n1 + n2
+    ties = np.unique(np.r_[x, y], return_counts=True)[1]
+    sd = math.sqrt(n1 * n2 / 12 * ((n + 1) - (ties ** 3 - ties).sum() / (n * (n - 1))))
+    mid, lo, hi = _median_and_ends((x[:, None] - y[None, :]).ravel(), _normal_lower(n1 * n2, sd))
+    hl = _shift(out)
+    assert (hl["value"], hl["ciLow"], hl["ciHigh"]) == (mid, lo, hi)
+    assert "normal approximation)." in out["test"]["reportSentence"]
+
+
+def test_walsh_drops_zero_differences_and_corrects_for_ties(run, rng):
+    y = rng.integers(0, 20, 120).astype(float)
+    x = y + rng.integers(-3, 6, 120)
+    out = run("wilcoxon-signed-rank", shape="pairs", pairs=np.c_[x, y].tolist())
+    d = (x - y)[x != y]
+    n = d.size
+    ties = np.unique(np.abs(d), return_counts=True)[1]
+    sd = math.sqrt(n * (n + 1) * (2 * n + 1) / 24 - (ties ** 3 - ties).sum() / 48)
+    i, j = np.triu_indices(n)
+    mid, lo, hi = _median_and_ends((d[i] + d[j]) / 2, _normal_lower(n * (n + 1) // 2, sd))
+    hl = _shift(out)
+    assert (hl["value"], hl["ciLow"], hl["ciHigh"]) == (mid, lo, hi)
+
+
+def test_all_zero_differences_give_no_interval(run):
+    out = run("wilcoxon-signed-rank", shape="pairs", pairs=[[1.0, 1.0], [2.0, 2.0], [3.0, 3.0]])
+    assert _shift(out) == {"name": "hodges-lehmann", "value": 0.0, "ciLow": None, "ciHigh": None}
+    assert "Hodges-Lehmann" not in out["test"]["reportSentence"]
@@ -0,0 +1,49 @@
+"""
+Normality by sample size: which test runs, that its numbers are SciPy's, and
+that the record says what ran without anyone parsing it back out of a name.
+"""
+import numpy as np
+from scipy import stats
+
+
+def test_shapiro_wilk_up_to_5000(run, rng):
+    x = rng.normal(size=300)
+    chk = run("normality", shape="columns", columns={"a": x.tolist()})["test"]["assumptions"][0]
+    w, p = stats.shapiro(x - x.mean())
+    assert chk["method"] == "Shapiro-Wilk" and chk["subsample"] is None
+    assert np.isclose(chk["statistic"], w, rtol=1e-12) and np.isclose(chk["pValue"], p, rtol=1e-12)
+
+
+def test_dagostino_pearson_between_5000_and_50000(run, rng):
+    x = rng.gamma(4.0, size=20_000)
+    chk = run("normality", shape="columns", columns={"a": x.tolist()})["test"]["assumptions"][0]
+    k2, p = stats.normaltest(x)
+    assert chk["method"] == "D'Agostino-Pearson" and chk["subsample"] is None
+    assert np.isclose(chk["statistic"], k2, rtol=1e-9) and np.isclose(chk["pValue"], p, rtol=1e-6, atol=1e-300)
+
+
+def test_seeded_subsample_beyond_50000(engine, run, rng):
+    x = rng.normal(size=60_000)
+    first = run("normality", shape="columns", columns={"a": x.tolist()})["test"]
+    again = run("normality", shape="columns", columns={"a": x.tolist()})["test"]
+    chk = first["assumptions"][0]
+    assert chk["method"] == "Shapiro-Wilk"
+    assert chk["subsample"] == {"size": engine._SHAPIRO_MAX_N, "of": 60_000, "seed": engine._NORMALITY_SEED}
+    assert chk["statistic"] == again["assumptions"][0]["statistic"]
+    assert "a (5000 of 60000)" in first["reportSentence"]
+
+
+def test_column_names_with_brackets_do_not_leak_into_the_sentence(run, rng):
+    cols = {"Weight (nM)": rng.normal(size=40).tolist(), "Dose (mg, oral)": rng.normal(size=8000).tolist()}
+    test = run("normality", shape="columns", columns=cols)["test"]
+    assert test["reportSentence"] == (
+        "Normality assessed by D'Agostino-Pearson and Shapiro-Wilk on each column.")
+    assert [a["method"] for a in test["assumptions"]] == ["Shapiro-Wilk", "D'Agostino-Pearson"]
+    assert test["assumptions"][0]["name"].startswith("Normality, Weight (nM)")
+
+
+def test_qq_points_are_thinned_order_statistics(run, rng):
+    x = rng.normal(size=3000)
+    qq = run("normality", shape="columns", columns={"a": x.tolist()})["test"]["assumptions"][0]["qq"]
+    assert qq["n"] == 3000 and len(qq["sample"]) <= 200
+    assert set(np.round(qq["sample"], 12)) <= set(np.round(np.sort(x - x.mean()), 12))
@@ -0,0 +1,85 @@
+"""
+Outlier screening: the generalized ESD's running-moment steps against Rosner's
+procedure recomputed from scratch at every step, and against the NIST worked
+example; flags name the row as sent, gaps included.
+"""
+import numpy as np
+import pytest
+from scipy import stats
+
+# NIST/SEMATECH e-Handbook 1.3.5.17.3, Rosner's 54 values: 3 outliers at r = 10.
+ROSNER = [
+    -0.25, 0.68, 0.94, 1.15, 1.20, 1.26, 1.26, 1.34, 1.38, 1.43, 1.49, 1.49, 1.55, 1.56,
+    1.58, 1.65, 1.69, 1.70, 1.76, 1.77, 1.81, 1.91, 1.94, 1.96, 1.99, 2.06, 2.09, 2.10,
+    2.14, 2.15, 2.23, 2.24, 2.26, 2.35, 2.37, 2.40, 2.47, 2.54, 2.62, 2.64, 2.90, 2.92,
+    2.92, 2.93, 3.21, 3.26, 3.30, 3.59, 3.68, 4.30, 4.64, 5.34, 5.42, 6.01,
+]
+
+
+def _reference_esd(x, r, alpha):
+    """Rosner (1983) as written: remove the most extreme value, recompute, r times."""
+    rest = list(enumerate(x))
+    steps = []
+    for _ in range(r):
+        v = np.array([val for _, val in rest])
+        dev = np.abs(v - v.mean())
+        j = int(np.argmax(dev))
+        n = len(rest)
+        tq = stats.t.ppf(1 - alpha / (2 * n), n - 2)
+        lam = (n - 1) * tq / np.sqrt((n - 2 + tq**2) * n)
+        steps.append((rest[j][0], dev[j] / v.std(ddof=1), lam))
+        rest.pop(j)
+    count = max((i + 1 for i, (_, rs, lam) in enumerate(steps) if rs > lam), default=0)
+    return sorted(i for i, _, _ in steps[:count]), steps
+
+
+def _esd(run, values, **payload):
+    return run("outliers", shape="groups", method="esd", groups={"g": values}, **payload)
+
+
+def test_nist_example(run):
+    out = _esd(run, ROSNER, maxOutliers=10)
+    g = out["outliers"]["groups"][0]
+    assert [f["value"] for f in g["flagged"]] == [5.34, 5.42, 6.01]
+    np.testing.assert_allclose([s["statistic"] for s in g["steps"][:3]], [3.118, 2.942, 3.179], atol=1e-3)
+    np.testing.assert_allclose([s["critical"] for s in g["steps"][:3]], [3.158, 3.151, 3.143], atol=1e-3)
+
+
+@pytest.mark.parametrize("alpha", [0.05, 0.01])
+def test_running_moments_match_recomputation(run, rng, alpha):
+    x = np.r_[rng.normal(size=300), rng.normal(0, 1, 6) * 0.5 + [6, -5, 7, 8, -9, 5.5]]
+    rng.shuffle(x)
+    flagged, steps = _reference_esd(x, 30, alpha)
+    g = _esd(run, x.tolist(), alpha=alpha, maxOutliers=30)["outliers"]["groups"][0]
+    assert [f["index"] for f in g["flagged"]] == flagged
+    assert [s["index"] for s in g["steps"]] == [i for i, _, _ in steps]
+    np.testing.assert_allclose([s["statistic"] for s in g["steps"]], [rs for _, rs, _ in steps], rtol=1e-9)
+    np.testing.assert_allclose([s["critical"] for s in g["steps"]], [lam for _, _, lam in steps], rtol=1e-12)
+
+
+def test_flags_name_the_row_as_sent(run):
+    values = [1.0, None, 1.2, "", 0.9, 1.1, 25.0, 1.05, 0.95, 1.0, 1.15, 0.85]
+    g = _esd(run, values, maxOutliers=2)["outliers"]["groups"][0]
+    assert [(f["index"], f["value"]) for f in g["flagged"]] == [(6, 25.0)]
+    assert g["n"] == 10
+
+
+def test_default_bound_is_a_tenth_of_n(run, rng):
+    g = _esd(run, rng.normal(size=85).tolist())["outliers"]["groups"][0]
+    assert g["maxOutliers"] == 8 and len(g["steps"]) == 8
+
+
+def test_rout_flags_gross_outliers_and_reports_the_robust_fit(run, rng):
+    x = np.r_[rng.normal(10, 1, size=60), [25.0, -4.0]]
+    out = run("outliers", shape="groups", method="rout", groups={"g": x.tolist()}, outlierQ=0.01)
+    g = out["outliers"]["groups"][0]
+    assert [f["index"] for f in g["flagged"]] == [60, 61]
+    assert abs(g["center"] - 10) < 0.5 and 0.5 < g["scale"] < 1.5
+    # Benjamini-Hochberg at Q over the t p-values of the scaled residuals.
+    assert all(f["pValue"] <= 0.01 for f in g["flagged"])
+
+
+def test_small_groups_are_not_screened(run):
+    out = _esd(run, [1.0, 2.0])
+    assert out["outliers"]["groups"][0]["flagged"] == []
+    assert any("at least 3" in w for w in out["warnings"])
@@ -0,0 +1,151 @@
+"""
+Analysis plans: every step gives what the same test gives run on its own, a
+`when` runs or skips a step on another step's assumption check and the two
+branches join again in a step after both, a repeated step is shared rather
+than recomputed, and a bad plan is an error before any step runs.
+"""
+import numpy as np
+import pytest
+
+
+def _strip(r):
+    if isinstance(r, dict):
+        return {k: _strip(v) for k, v in r.items() if k != "durationMs"}
+    if isinstance(r, list):
+        return [_strip(v) for v in r]
+    return r
+
+
+def _plan(run, groups, steps, **payload):
+    return run("plan", shape="groups", groups=groups, steps=steps, **payload)
+
+
+def _steps(out):
+    return {s["id"]: s for s in out["plan"]["steps"]}
+
+
+def test_each_step_equals_the_test_run_alone(run, rng):
+    groups = {g: rng.normal(mu, 1, 40).tolist() for g, mu in zip("abc", (0, 0.3, 0.8))}
+    steps = [{"id": "desc", "test": "descriptives"},
+             {"id": "anova", "test": "anova-one-way", "options": {"postHoc": "tukey"}},
+             {"id": "kw", "test": "kruskal-wallis", "after": ["anova"]}]
+    out = _plan(run, groups, steps)
+    assert out["error"] is None
+    got = _steps(out)
+    for s in steps:
+        alone = run(s["test"], shape="groups", groups=groups, **s.get("options", {}))
+        assert got[s["id"]]["status"] == "ran"
+        assert _strip(got[s["id"]]["result"]["test"]) == _strip(alone["test"])
+    assert out["plan"]["steps"][2]["dependsOn"] == ["anova"]
+
+
+@pytest.mark.parametrize("skewed", [False, True])
+def test_when_branches_on_the_normality_check(run, rng, skewed):
+    draw = (lambda: rng.lognormal(0, 1.2, 60)) if skewed else (lambda: rng.normal(size=60))
+    groups = {g: draw().tolist() for g in "abc"}
+    out = _plan(run, groups, [
+        {"id": "anova", "test": "anova-one-way"},
+        {"id": "kw", "test": "kruskal-wallis", "when": {"step": "anova", "check": "normality", "passed": False}},
+    ])
+    steps = _steps(out)
+    normal = [a for a in steps["anova"]["result"]["test"]["assumptions"] if a["name"].startswith("Normality")]
+    assert normal[0]["passed"] is not skewed
+    assert steps["kw"]["status"] == ("ran" if skewed else "skipped")
+    assert steps["kw"]["dependsOn"] == ["anova"]
+    assert steps["kw"]["reason"] == f"Normality (Shapiro-Wilk) {'failed' if skewed else 'passed'} on step 'anova'"
+
+
+@pytest.mark.parametrize("skewed", [False, True])
+def test_branches_join_again_after_either_runs(run, rng, skewed):
+    draw = (lambda: rng.lognormal(0, 1.2, 60)) if skewed else (lambda: rng.normal(size=60))
+    groups = {g: draw().tolist() for g in "abc"}
+    out = _plan(run, groups, [
+        {"id": "check", "test": "anova-one-way"},
+        {"id": "anova", "test": "anova-one-way", "options": {"postHoc": "tukey"},
+         "when": {"step": "check", "check": "normality", "passed": True}},
+        {"id": "kw", "test": "kruskal-wallis", "when": {"step": "check", "check": "normality", "passed": False}},
+        {"id": "dist", "test": "distribution", "after": ["anova", "kw"]},
+    ])
+    steps = _steps(out)
+    assert (steps["anova"]["status"], steps["kw"]["status"]) == (
+        ("skipped", "ran") if skewed else ("ran", "skipped"))
+    assert steps["dist"]["status"] == "ran" and steps["dist"]["reason"] is None
+    alone = run("distribution", shape="groups", groups=groups)
+    assert _strip(steps["dist"]["result"]["distribution"]) == _strip(alone["distribution"])
+
+
+def test_a_step_after_one_that_did_not_run_is_skipped(run):
+    out = _plan(run, {"a": [1.0, 2.0, 3.0]}, [
+        {"id": "t", "test": "t-welch"},
+        {"id": "next", "test": "descriptives", "after": ["t"]},
+    ])
+    steps = _steps(out)
+    assert steps["t"]["status"] == "failed" and steps["t"]["error"]["code"] == "test-failed"
+    assert steps["next"]["status"] == "skipped" and "did not run: t" in steps["next"]["reason"]
+
+
+def test_a_failure_blocks_past_a_branch(run):
+    # mid was skipped for a failure, not by a branch, so end is blocked too.
+    out = _plan(run, {"a": [1.0, 2.0, 3.0]}, [
+        {"id": "t", "test": "t-welch"},
+        {"id": "mid", "test": "descriptives", "after": ["t"]},
+        {"id": "end", "test": "descriptives", "after": ["mid"]},
+    ])
+    steps = _steps(out)
+    assert [steps[i]["status"] for i in ("t", "mid", "end")] == ["failed", "skipped", "skipped"]
+    assert "did not run: mid" in steps["end"]["reason"]
+
+
+def test_a_repeated_step_is_shared_not_recomputed(engine, run, rng, monkeypatch):
+    groups = {g: rng.normal(size=30).tolist() for g in "ab"}
+    calls = []
+    welch = engine.REGISTRY["t-welch"]
+    monkeypatch.setitem(engine.REGISTRY, "t-welch", lambda p: calls.append(1) or welch(p))
+    out = _plan(run, groups, [{"id": "one", "test": "t-welch", "options": {"tails": "two"}},
+                              {"id": "two", "test": "t-welch", "options": {"tails": "two"}},
+                              {"id": "less", "test": "t-welch", "options": {"tails": "less"}}])
+    steps = _steps(out)
+    assert len(calls) == 2
+    assert steps["two"]["sharedWith"] == "one" and steps["less"]["sharedWith"] is None
+    assert steps["two"]["result"] == steps["one"]["result"]
+    assert steps["two"]["result"] is not steps["one"]["result"]
+    assert out["test"]["reportSentence"].startswith("Analysis plan: 3 of 3 steps ran (t-welch, t-welch)")
+    assert engine._shared is None
+
+
+@pytest.mark.parametrize("steps, message", [
+    ([], "at least one step"),
+    ([{"id": "x", "test": "t-welch"}, {"id": "x", "test": "mann-whitney"}], "'x' is used twice"),
+    ([{"id": "x", "test": "no-such-test"}], "names no runnable test: 'no-such-test'"),
+    ([{"id": "x", "test": "plan"}], "names no runnable test: 'plan'"),
+    ([{"id": "x", "test": "t-welch", "after": ["y"]}], "depends on unknown step(s): y"),
+    ([{"id": "x", "test": "t-welch", "after": ["y"]}, {"id": "y", "test": "t-welch", "after": ["x"]}],
+     "in a cycle: x, y"),
+])
+def test_a_bad_plan_is_an_error(run, steps, message):
+    out = _plan(run, {"a": [1.0, 2.0], "b": [3.0, 4.0]}, steps)
+    assert out["plan"] is None and out["error"]["code"] == "test-failed"
+    assert message in out["error"]["detail"]
+
+
+def test_time_budget_stops_between_steps(engine, run, rng, monkeypatch):
+    groups = {g: rng.normal(size=40).tolist() for g in "abc"}
+    checkpoint = engine._checkpoint
+
+    def stop_in_kruskal(stage):
+        if engine._deadline is not None and stage.startswith("kruskal"):
+            raise engine._BudgetExceeded(stage)
+        return checkpoint(stage)
+    monkeypatch.setattr(engine, "_checkpoint", stop_in_kruskal)
+    monkeypatch.setitem(engine.REGISTRY, "kruskal-wallis",
+                        lambda p: engine._checkpoint("kruskal-wallis"))
+    out = _plan(run, groups, [{"id": "anova", "test": "anova-one-way"},
+                              {"id": "kw", "test": "kruskal-wallis"},
+                              {"id": "desc", "test": "descriptives"}], timeBudgetMs=60_000)
+    steps = _steps(out)
+    assert out["error"] is None
+    assert [steps[i]["status"] for i in ("anova", "kw", "desc")] == ["ran", "failed", "skipped"]
+    assert steps["kw"]["error"]["code"] == "budget-exceeded"
+    assert steps["desc"]["reason"] == "not started: the time budget ran out"
+    assert out["partial"] == {"completed": 1, "total": 3, "unit": "steps", "stage": "kruskal-wallis"}
+    assert np.isfinite(steps["anova"]["result"]["test"]["pValue"])
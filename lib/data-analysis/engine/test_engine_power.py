@@ -0,0 +1,81 @@
+"""
+Power and sample size against statsmodels' noncentral-t and noncentral-F
+calculations, design by design, and for the correlation design (the one
+approximation) against simulated Pearson tests.
+"""
+import numpy as np
+import pytest
+from scipy import stats
+from statsmodels.stats.power import FTestAnovaPower, TTestIndPower, TTestPower
+
+ALT = {"two": "two-sided", "greater": "larger", "less": "smaller"}
+
+
+def _power(run, design, **payload):
+    return run("power", shape="power", design=design, **payload)["power"]
+
+
+def _reference(design, tails, k):
+    if design in ("t-one-sample", "t-paired"):
+        return lambda n, es: TTestPower().power(es, n, 0.05, alternative=ALT[tails])
+    if design in ("t-unpaired", "t-welch"):
+        return lambda n, es: TTestIndPower().power(es, n, 0.05, ratio=1.0, alternative=ALT[tails])
+    return lambda n, es: FTestAnovaPower().power(es, n * k, 0.05, k_groups=k)
+
+
+@pytest.mark.parametrize("design, tails", [
+    ("t-one-sample", "two"), ("t-paired", "greater"), ("t-unpaired", "two"),
+    ("t-welch", "less"), ("anova-one-way", "two"),
+])
+def test_surface_and_required_n_match_statsmodels(run, design, tails):
+    k = 4
+    effects = [0.2, 0.5, 0.8] if tails != "less" else [-0.2, -0.5, -0.8]
+    if design == "anova-one-way":
+        effects = [0.1, 0.25, 0.4]
+    out = _power(run, design, effectSizes=effects, tails=tails, groupCount=k,
+                 sampleSizes=[5, 10, 20, 50, 100])
+    ref = _reference(design, tails, k)
+    want = [[ref(n, es) for n in out["sampleSizes"]] for es in effects]
+    np.testing.assert_allclose(out["power"], want, rtol=1e-7, atol=1e-12)
+
+    for row in out["required"]:
+        n, es = row["n"], row["effectSize"]
+        # The smallest integer n at the target: reaches it, and one fewer does not.
+        assert ref(n, es) >= 0.8 > ref(n - 1, es)
+        assert np.isclose(row["achievedPower"], ref(n, es), rtol=1e-7)
+        assert row["total"] == n * (k if design == "anova-one-way" else 2 if "per group" == out["nUnit"] else 1)
+
+
+def test_solved_n_agrees_with_statsmodels_solver(run):
+    out = _power(run, "t-unpaired", effectSizes=[0.5], targetPower=0.9)
+    solved = TTestIndPower().solve_power(0.5, power=0.9, alpha=0.05)
+    assert out["required"][0]["n"] == int(np.ceil(solved))
+
+
+def test_pearson_power_against_simulation(run):
+    rng = np.random.default_rng(7)
+    n, rho, sims = 30, 0.4, 20_000
+    out = _power(run, "correlation-pearson", effectSizes=[rho], sampleSizes=[n])
+    z = rng.standard_normal((sims, n, 2))
+    x = z[..., 0]
+    y = rho * x + np.sqrt(1 - rho**2) * z[..., 1]
+    xc, yc = x - x.mean(1, keepdims=True), y - y.mean(1, keepdims=True)
+    r = (xc * yc).sum(1) / np.sqrt((xc**2).sum(1) * (yc**2).sum(1))
+    t = r * np.sqrt((n - 2) / (1 - r**2))
+    simulated = np.mean(np.abs(t) > stats.t.ppf(0.975, n - 2))
+    # Fisher's z without its small bias term understates power slightly at
+    # small n (about 1.5 points here), so a solved n errs on the large side.
+    assert 0 <= simulated - out["power"][0][0] < 0.025
+
+
+def test_unreachable_effects_are_reported_not_solved(run):
+    res = run("power", shape="power", design="t-one-sample", effectSizes=[0.0, -0.5, 0.5],
+              tails="greater")
+    ns = [r["n"] for r in res["power"]["required"]]
+    assert ns[0] is None and ns[1] is None and ns[2] is not None
+    assert any("cannot be powered" in w for w in res["warnings"])
+
+
+def test_unknown_design_is_an_error(run):
+    out = run("power", shape="power", design="kruskal-wallis")
+    assert out["power"] is None and out["error"]["code"] == "test-failed"
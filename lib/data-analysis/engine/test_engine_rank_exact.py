@@ -0,0 +1,89 @@
+"""
+Exact rank-test p-values: SciPy's where SciPy has an exact answer (no ties),
+full enumeration of the permutation distribution where it does not, and the
+null tables read back from the host's directory equal to the ones built.
+"""
+import itertools
+
+import numpy as np
+import pytest
+from scipy import stats
+
+
+@pytest.mark.parametrize("tails", ["two", "greater", "less"])
+def test_mann_whitney_matches_scipy_without_ties(run, rng, tails):
+    a, b = rng.normal(size=9), rng.normal(0.8, size=12)
+    test = run("mann-whitney", shape="groups", groups={"a": a.tolist(), "b": b.tolist()},
+               tails=tails)["test"]
+    alt = {"two": "two-sided", "greater": "greater", "less": "less"}[tails]
+    ref = stats.mannwhitneyu(a, b, alternative=alt, method="exact")
+    assert np.isclose(test["statistic"], ref.statistic)
+    assert np.isclose(test["pValue"], ref.pvalue, rtol=1e-10)
+    assert "(exact;" in test["reportSentence"]
+
+
+@pytest.mark.parametrize("tails", ["two", "greater", "less"])
+def test_wilcoxon_matches_scipy_without_ties(run, rng, tails):
+    x = rng.normal(size=14)
+    y = x - rng.normal(0.4, size=14)
+    test = run("wilcoxon-signed-rank", shape="pairs", pairs=np.c_[x, y].tolist(), tails=tails)["test"]
+    alt = {"two": "two-sided", "greater": "greater", "less": "less"}[tails]
+    ref = stats.wilcoxon(x, y, alternative=alt, method="exact")
+    assert np.isclose(test["statistic"], ref.statistic)
+    assert np.isclose(test["pValue"], ref.pvalue, rtol=1e-10)
+
+
+def test_mann_whitney_with_ties_is_the_permutation_distribution(run):
+    a = [1, 2, 2, 3, 3, 3, 5]
+    b = [2, 3, 4, 4, 5, 5, 6, 6]
+    pooled = np.array(a + b, dtype=float)
+    ranks = stats.rankdata(pooled)
+    observed = ranks[: len(a)].sum()
+    sums = np.array([ranks[list(c)].sum() for c in itertools.combinations(range(pooled.size), len(a))])
+    lo, hi = np.mean(sums <= observed + 1e-9), np.mean(sums >= observed - 1e-9)
+    for tails, want in (("less", lo), ("greater", hi), ("two", min(1.0, 2 * min(lo, hi)))):
+        got = run("mann-whitney", shape="groups", groups={"a": a, "b": b}, tails=tails)["test"]
+        assert np.isclose(got["pValue"], want, rtol=1e-12), tails
+
+
+def test_wilcoxon_with_ties_and_zeros_is_the_sign_flip_distribution(run):
+    diff = np.array([0.0, 1, -1, 2, 2, -2, 3, 3, 3, -4, 5])
+    pairs = np.c_[diff, np.zeros_like(diff)]
+    d = diff[diff != 0]
+    ranks = stats.rankdata(np.abs(d))
+    observed = ranks[d > 0].sum()
+    w = np.array([ranks[np.array(s) > 0].sum() for s in itertools.product([-1, 1], repeat=d.size)])
+    lo, hi = np.mean(w <= observed + 1e-9), np.mean(w >= observed - 1e-9)
+    for tails, want in (("less", lo), ("greater", hi), ("two", min(1.0, 2 * min(lo, hi)))):
+        got = run("wilcoxon-signed-rank", shape="pairs", pairs=pairs.tolist(), tails=tails)["test"]
+        assert np.isclose(got["pValue"], want, rtol=1e-12), tails
+
+
+def test_null_tables_persist_in_the_host_directory(engine, tmp_path, monkeypatch):
+    counts = (1, 2, 1, 3, 1, 1, 2, 1)
+    built = engine._build_rank_sum_null(5, counts)
+    monkeypatch.setattr(engine, "RANK_TABLE_DIR", str(tmp_path))
+    first = engine._stored_null("rank-sum", (5, counts), lambda: built)
+    assert len(list(tmp_path.glob("rank-null-*.npy"))) == 1
+
+    def fail():
+        raise AssertionError("rebuilt a stored table")
+    again = engine._stored_null("rank-sum", (5, counts), fail)
+    for got, want in zip((*first, *again), (*built, *built)):
+        np.testing.assert_array_equal(got, want)
+
+
+def test_unusable_table_directory_costs_a_rebuild_only(engine, tmp_path, monkeypatch):
+    missing = tmp_path / "gone"
+    monkeypatch.setattr(engine, "RANK_TABLE_DIR", str(missing))
+    cdf, sf = engine._stored_null("signed-rank", ((1, 1, 2),), lambda: engine._build_signed_rank_null((1, 1, 2)))
+    np.testing.assert_allclose(cdf[-1], 1.0)
+    assert not missing.exists()
+
+    monkeypatch.setattr(engine, "RANK_TABLE_DIR", str(tmp_path))
+    build = lambda: engine._build_signed_rank_null((2, 1))
+    engine._stored_null("signed-rank", ((2, 1),), build)
+    (stored,) = tmp_path.glob("rank-null-*.npy")
+    stored.write_bytes(b"not a table")
+    cdf, sf = engine._stored_null("signed-rank", ((2, 1),), build)
+    np.testing.assert_array_equal(np.vstack([cdf, sf]), np.vstack(build()))
@@ -0,0 +1,92 @@
+"""
+ROC analysis against DeLong, DeLong and Clarke-Pearson (1988) as written: the
+O(mn) placement values of every positive against every negative, ties counted
+half, for the AUCs, their covariance, the pairwise z and the chi-square test.
+"""
+import numpy as np
+import pytest
+from scipy import stats
+
+
+def _delong(scores, positive):
+    """AUCs and their covariance from the pairwise comparison matrix."""
+    v10, v01 = [], []
+    for s in scores:
+        x, y = s[positive], s[~positive]
+        psi = (x[:, None] > y[None, :]) + 0.5 * (x[:, None] == y[None, :])
+        v10.append(psi.mean(1))
+        v01.append(psi.mean(0))
+    v10, v01 = np.array(v10), np.array(v01)
+    cov = np.atleast_2d(np.cov(v10)) / v10.shape[1] + np.atleast_2d(np.cov(v01)) / v01.shape[1]
+    return v10.mean(1), cov
+
+
+def _markers(rng, n=400):
+    y = rng.random(n) < 0.35
+    a = np.round(rng.normal(size=n) + 1.0 * y, 1)  # rounded, so scores tie
+    b = np.round(0.6 * a + rng.normal(size=n) + 0.4 * y, 1)
+    c = rng.integers(0, 5, size=n) + y  # heavily tied
+    return y, np.vstack([a, b, c]).astype(float)
+
+
+def test_single_marker_auc_and_se(run, rng):
+    y, scores = _markers(rng)
+    out = run("roc", shape="roc", markers={"a": scores[0].tolist()}, outcome=y.astype(int).tolist())
+    auc, cov = _delong(scores[:1], y)
+    m = out["roc"]["markers"][0]
+    assert np.isclose(m["auc"], auc[0], rtol=1e-12)
+    assert np.isclose(m["se"], np.sqrt(cov[0, 0]), rtol=1e-10)
+    assert np.isclose(out["test"]["pValue"], 2 * stats.norm.sf(abs(auc[0] - 0.5) / np.sqrt(cov[0, 0])),
+                      rtol=1e-9)
+    # The AUC is Mann-Whitney U over P N.
+    u = stats.mannwhitneyu(scores[0][y], scores[0][~y]).statistic
+    assert np.isclose(m["auc"], u / (y.sum() * (~y).sum()), rtol=1e-12)
+
+
+def test_paired_comparison_and_chi_square(run, rng):
+    y, scores = _markers(rng)
+    out = run("roc", shape="roc", markers={k: s.tolist() for k, s in zip("abc", scores)},
+              outcome=y.astype(int).tolist())
+    auc, cov = _delong(scores, y)
+    np.testing.assert_allclose([m["auc"] for m in out["roc"]["markers"]], auc, rtol=1e-12)
+    np.testing.assert_allclose([m["se"] for m in out["roc"]["markers"]], np.sqrt(np.diag(cov)), rtol=1e-10)
+
+    raw = []
+    for row, (i, j) in zip(out["test"]["pairwise"], [(0, 1), (0, 2), (1, 2)]):
+        sd = np.sqrt(cov[i, i] + cov[j, j] - 2 * cov[i, j])
+        raw.append(2 * stats.norm.sf(abs(auc[i] - auc[j]) / sd))
+        assert np.isclose(row["meanDifference"], auc[i] - auc[j], rtol=1e-12)
+        assert np.isclose(row["pValue"], raw[-1], rtol=1e-9)
+    # Holm, step-down.
+    order = np.argsort(raw)
+    holm = np.minimum(1, np.maximum.accumulate(np.array(raw)[order] * (3 - np.arange(3))))
+    np.testing.assert_allclose([out["test"]["pairwise"][k]["pAdjusted"] for k in order], holm, rtol=1e-9)
+
+    contrast = np.array([[1, -1, 0], [0, 1, -1]])
+    d = contrast @ auc
+    chi2 = d @ np.linalg.inv(contrast @ cov @ contrast.T) @ d
+    assert np.isclose(out["test"]["statistic"], chi2, rtol=1e-8)
+    assert out["test"]["df"] == 2 and np.isclose(out["test"]["pValue"], stats.chi2.sf(chi2, 2), rtol=1e-8)
+
+
+def test_lower_direction_flips_scores_not_thresholds(run, rng):
+    y, scores = _markers(rng, 200)
+    hi = run("roc", shape="roc", markers={"a": scores[0].tolist()}, outcome=y.astype(int).tolist())
+    lo = run("roc", shape="roc", markers={"a": (-scores[0]).tolist()}, outcome=y.astype(int).tolist(),
+             direction="lower")
+    a, b = hi["roc"]["markers"][0], lo["roc"]["markers"][0]
+    assert np.isclose(a["auc"], b["auc"]) and np.isclose(a["se"], b["se"])
+    assert b["youden"]["threshold"] == -a["youden"]["threshold"]
+
+
+def test_incomplete_rows_are_dropped_with_a_warning(run):
+    out = run("roc", shape="roc", markers={"a": [0.1, 0.4, None, 0.8, 0.3, 0.9, 0.2]},
+              outcome=[0, 0, 1, 1, None, 1, 2])
+    assert out["roc"]["positives"] == 2 and out["roc"]["negatives"] == 2
+    assert any("3 row(s)" in w for w in out["warnings"])
+
+
+@pytest.mark.parametrize("outcome", [[1, 1, 1, 0], [0, 0, 0, 0]])
+def test_too_few_cases_in_a_class_is_an_error(run, outcome):
+    out = run("roc", shape="roc", markers={"a": [0.1, 0.2, 0.3, 0.4]}, outcome=outcome)
+    assert out["roc"] is None and out["error"]["code"] == "test-failed"
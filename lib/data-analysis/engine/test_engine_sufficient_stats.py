@@ -0,0 +1,123 @@
+"""
+Incremental runs: a snapshot sent back as priorStats with only the new rows
+gives the same answer as the full recompute, for every snapshot kind, and a
+routine that cannot be updated from a snapshot says so instead of answering.
+"""
+import json
+
+import numpy as np
+import pytest
+from scipy import stats
+
+
+def _incremental(run, test, first, rest, **common):
+    """Run on `first`, then on `rest` with the first run's snapshot as the prior."""
+    snap = run(test, **common, **first)["sufficientStats"]
+    # The snapshot travels through the host as JSON.
+    prior = json.loads(json.dumps(snap))
+    return run(test, **common, **rest, priorStats=prior)
+
+
+def _same(a, b):
+    for key in ("statistic", "pValue"):
+        assert np.isclose(a["test"][key], b["test"][key], rtol=1e-9), key
+    for ea, eb in zip(a["test"]["effectSizes"], b["test"]["effectSizes"]):
+        assert np.isclose(ea["value"], eb["value"], rtol=1e-9), ea["name"]
+
+
+@pytest.mark.parametrize("test", ["t-unpaired", "t-welch", "anova-one-way"])
+def test_groups_merge_equals_full_recompute(run, rng, test):
+    k = 3 if test == "anova-one-way" else 2
+    data = {f"g{i}": rng.normal(i * 0.3, 1 + i, size=40 + 7 * i) for i in range(k)}
+    common = {"shape": "groups", "equalVariance": test == "t-unpaired"}
+    full = run(test, **common, groups={n: v.tolist() for n, v in data.items()})
+    inc = _incremental(run, test,
+                       {"groups": {n: v[:15].tolist() for n, v in data.items()}},
+                       {"groups": {n: v[15:].tolist() for n, v in data.items()}}, **common)
+    _same(full, inc)
+
+    for name, v in data.items():
+        s = inc["sufficientStats"]["groups"][name]
+        d = v - v.mean()
+        assert s["n"] == v.size and np.isclose(s["mean"], v.mean(), rtol=1e-12)
+        np.testing.assert_allclose([s["m2"], s["m3"], s["m4"]],
+                                   [np.sum(d**2), np.sum(d**3), np.sum(d**4)], rtol=1e-9, atol=1e-9)
+        assert (s["min"], s["max"]) == (v.min(), v.max())
+        # The moments are the ones scipy's shape statistics are built from.
+        assert np.isclose(s["m3"] / s["n"] / (s["m2"] / s["n"]) ** 1.5, stats.skew(v), rtol=1e-9)
+
+
+def test_a_group_new_in_the_appended_rows_is_a_new_group(run, rng):
+    a, b, c = rng.normal(size=30), rng.normal(1, size=30), rng.normal(2, size=20)
+    full = run("anova-one-way", shape="groups", groups={"a": a.tolist(), "b": b.tolist(), "c": c.tolist()})
+    inc = _incremental(run, "anova-one-way",
+                       {"groups": {"a": a[:10].tolist(), "b": b.tolist()}},
+                       {"groups": {"a": a[10:].tolist(), "c": c.tolist()}},
+                       shape="groups")
+    _same(full, inc)
+    assert list(inc["sufficientStats"]["groups"]) == ["a", "b", "c"]
+
+
+def test_pairs_merge_equals_full_recompute(run, rng):
+    x = rng.normal(size=60)
+    pairs = np.c_[x, x - rng.normal(0.2, 1, size=60)]
+    full = run("t-paired", shape="pairs", pairs=pairs.tolist())
+    inc = _incremental(run, "t-paired", {"pairs": pairs[:25].tolist()}, {"pairs": pairs[25:].tolist()},
+                       shape="pairs")
+    _same(full, inc)
+    ref = stats.ttest_rel(pairs[:, 0], pairs[:, 1])
+    assert np.isclose(inc["test"]["statistic"], ref.statistic, rtol=1e-9)
+    assert np.isclose(inc["test"]["pValue"], ref.pvalue, rtol=1e-9)
+
+
+@pytest.mark.parametrize("test", ["correlation-pearson", "linear-regression"])
+def test_xy_merge_equals_full_recompute(run, rng, test):
+    x = rng.normal(5, 2, size=80)
+    y = 1.5 * x + rng.normal(size=80)
+    full = run(test, shape="xy", x=x.tolist(), y=y.tolist())
+    inc = _incremental(run, test, {"x": x[:30].tolist(), "y": y[:30].tolist()},
+                       {"x": x[30:].tolist(), "y": y[30:].tolist()}, shape="xy")
+    _same(full, inc)
+    ref = stats.linregress(x, y)
+    want = ref.rvalue if test == "correlation-pearson" else ref.slope
+    assert np.isclose(inc["test"]["statistic"], want, rtol=1e-9)
+    assert np.isclose(inc["test"]["pValue"], ref.pvalue, rtol=1e-9)
+
+
+def test_table_merge_adds_counts(run):
+    first, rest = [[12, 5], [7, 14]], [[8, 10], [3, 9]]
+    full = run("chi-square", shape="table", table=(np.add(first, rest)).tolist())
+    inc = _incremental(run, "chi-square", {"table": first}, {"table": rest}, shape="table")
+    _same(full, inc)
+    assert inc["sufficientStats"]["table"] == [[20, 15], [10, 23]]
+
+
+def test_table_shape_mismatch_is_an_error(run):
+    prior = run("chi-square", shape="table", table=[[3, 4], [5, 6]])["sufficientStats"]
+    out = run("chi-square", shape="table", table=[[1, 2, 3], [4, 5, 6]], priorStats=prior)
+    assert out["test"] is None and out["error"]["code"] == "test-failed"
+    assert "2x2" in out["error"]["detail"] and "2x3" in out["error"]["detail"]
+
+
+@pytest.mark.parametrize("test, payload", [
+    ("mann-whitney", {"shape": "groups", "groups": {"a": [1, 2], "b": [3, 4]}}),
+    ("correlation-spearman", {"shape": "xy", "x": [1, 2, 3], "y": [3, 1, 2]}),
+])
+def test_routines_without_a_snapshot_refuse_a_prior(run, test, payload):
+    prior = {"kind": "groups", "groups": {"a": {"n": 5}}}
+    out = run(test, **payload, priorStats=prior)
+    assert out["error"]["code"] == "needs-full-data" and out["test"] is None
+
+
+def test_a_prior_of_the_wrong_kind_is_refused(run):
+    prior = run("t-paired", shape="pairs", pairs=[[1, 2], [3, 5], [4, 4]])["sufficientStats"]
+    out = run("t-welch", shape="groups", groups={"a": [1, 2, 3], "b": [2, 3, 4]}, priorStats=prior)
+    assert out["error"]["code"] == "needs-full-data"
+
+
+def test_raw_data_checks_are_not_assessable_on_an_incremental_run(run, rng):
+    a, b = rng.normal(size=30), rng.normal(size=30)
+    inc = _incremental(run, "t-welch", {"groups": {"a": a[:10].tolist(), "b": b[:10].tolist()}},
+                       {"groups": {"a": a[10:].tolist(), "b": b[10:].tolist()}}, shape="groups")
+    assert inc["test"]["assumptions"]
+    assert all(c["pValue"] is None for c in inc["test"]["assumptions"])
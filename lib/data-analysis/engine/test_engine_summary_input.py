@@ -0,0 +1,87 @@
+"""
+Summary input (n, mean, SD per group): the t-tests and one-way ANOVA give the
+raw-data answer and SciPy's from-stats answer, what n, mean and SD cannot
+determine comes back null, and every other test asks for the raw values.
+"""
+import numpy as np
+import pytest
+from scipy import stats
+
+
+def _summaries(data):
+    return {n: {"n": int(v.size), "mean": float(v.mean()), "sd": float(v.std(ddof=1))}
+            for n, v in data.items()}
+
+
+@pytest.mark.parametrize("test, equal", [("t-welch", False), ("t-unpaired", True)])
+def test_two_sample_t_equals_raw_and_scipy(run, rng, test, equal):
+    data = {"ctrl": rng.normal(10, 2, size=14), "drug": rng.normal(12, 3, size=9)}
+    raw = run(test, shape="groups", groups={n: v.tolist() for n, v in data.items()}, equalVariance=equal)
+    summ = run(test, shape="summary", summaries=_summaries(data), equalVariance=equal)
+    for key in ("statistic", "df", "pValue"):
+        assert np.isclose(summ["test"][key], raw["test"][key], rtol=1e-10), key
+    assert np.isclose(summ["test"]["effectSizes"][0]["value"], raw["test"]["effectSizes"][0]["value"])
+    s = _summaries(data)
+    ref = stats.ttest_ind_from_stats(s["ctrl"]["mean"], s["ctrl"]["sd"], s["ctrl"]["n"],
+                                     s["drug"]["mean"], s["drug"]["sd"], s["drug"]["n"], equal_var=equal)
+    assert np.isclose(summ["test"]["statistic"], ref.statistic, rtol=1e-10)
+    assert np.isclose(summ["test"]["pValue"], ref.pvalue, rtol=1e-10)
+
+
+def test_one_sample_t_equals_raw(run, rng):
+    x = rng.normal(0.4, 1, size=20)
+    raw = run("t-one-sample", shape="groups", groups={"x": x.tolist()}, mu0=0.1)
+    summ = run("t-one-sample", shape="summary", summaries=_summaries({"x": x}), mu0=0.1)
+    ref = stats.ttest_1samp(x, 0.1)
+    for out in (raw, summ):
+        assert np.isclose(out["test"]["statistic"], ref.statistic, rtol=1e-10)
+        assert np.isclose(out["test"]["pValue"], ref.pvalue, rtol=1e-10)
+
+
+def test_anova_equals_raw_and_scipy(run, rng):
+    data = {g: rng.normal(mu, 1.5, size=n) for g, mu, n in (("a", 5, 8), ("b", 6, 11), ("c", 7.5, 6))}
+    summ = run("anova-one-way", shape="summary", summaries=_summaries(data), postHoc="tukey")
+    raw = run("anova-one-way", shape="groups", groups={n: v.tolist() for n, v in data.items()},
+              postHoc="tukey")
+    ref = stats.f_oneway(*data.values())
+    assert np.isclose(summ["test"]["statistic"], ref.statistic, rtol=1e-10)
+    assert np.isclose(summ["test"]["pValue"], ref.pvalue, rtol=1e-10)
+    for a, b in zip(summ["test"]["pairwise"], raw["test"]["pairwise"]):
+        assert np.isclose(a["pAdjusted"], b["pAdjusted"], rtol=1e-9)
+
+
+def test_descriptives_carry_only_what_the_summary_determines(run, rng):
+    x = rng.normal(3, 1, size=12)
+    out = run("t-one-sample", shape="summary", summaries=_summaries({"x": x}))
+    d = out["descriptives"][0]
+    assert d["n"] == 12 and np.isclose(d["mean"], x.mean()) and np.isclose(d["sd"], x.std(ddof=1))
+    assert np.isclose(d["sem"], stats.sem(x))
+    assert all(d[k] is None for k in ("median", "q1", "q3", "min", "max", "skewness", "kurtosis",
+                                      "geometricMean"))
+    # The checks that need the values are marked not assessable, not skipped silently.
+    assert out["test"]["assumptions"] and all(c["pValue"] is None for c in out["test"]["assumptions"])
+
+
+@pytest.mark.parametrize("summary", [
+    {"n": 0, "mean": 1, "sd": 1}, {"n": 5, "mean": 1, "sd": -1}, {"n": 5, "mean": float("nan"), "sd": 1},
+    {"n": 5, "mean": 1}, {"n": 5, "mean": 1, "sd": None}, {"n": 5, "mean": 1, "sd": float("inf")},
+    {"n": 10.7, "mean": 1, "sd": 1}, {"n": "ten", "mean": 1, "sd": 1}, {"n": True, "mean": 1, "sd": 1},
+])
+def test_impossible_summaries_are_errors(run, summary):
+    out = run("t-welch", shape="summary", summaries={"a": summary, "b": {"n": 5, "mean": 0, "sd": 1}})
+    assert out["test"] is None and out["error"]["code"] == "test-failed"
+    assert "a whole n >= 1, a finite mean and a finite SD >= 0" in out["error"]["detail"]
+    assert out["descriptives"] == []
+
+
+def test_a_whole_float_n_is_accepted(run):
+    out = run("t-welch", shape="summary", summaries={"a": {"n": 6.0, "mean": 1, "sd": 1},
+                                                     "b": {"n": 5, "mean": 0, "sd": 1}})
+    assert out["error"] is None and out["test"]["groupSizes"]["a"] == 6
+
+
+@pytest.mark.parametrize("test", ["mann-whitney", "kruskal-wallis", "t-paired", "chi-square"])
+def test_other_tests_need_the_raw_values(run, test):
+    out = run(test, shape="summary", summaries={"a": {"n": 5, "mean": 0, "sd": 1},
+                                                "b": {"n": 5, "mean": 1, "sd": 1}})
+    assert out["error"]["code"] == "needs-full-data" and "raw values" in out["error"]["message"]
@@ -0,0 +1,124 @@
+"""
+Time-course AUCs against a per-series loop: linear trapezoids (np.trapezoid),
+linear-up/log-down, baseline-corrected areas and peaks, on shared and ragged
+time axes, and the per-group SE as the SE of the mean AUC.
+"""
+import math
+
+import numpy as np
+import pytest
+from scipy import stats
+
+
+def _series_auc(t, y, log_down=False):
+    ok = [(a, b) for a, b in zip(t, y) if a is not None and b is not None]
+    ok.sort()
+    if len(ok) < 2:
+        return None
+    total = 0.0
+    for (t1, y1), (t2, y2) in zip(ok, ok[1:]):
+        if log_down and y1 > y2 > 0:
+            total += (t2 - t1) * (y1 - y2) / math.log(y1 / y2)
+        else:
+            total += (t2 - t1) * (y1 + y2) / 2
+    return total
+
+
+def _pk(rng, k=8):
+    times = [0, 0.5, 1, 2, 4, 6, 8, 12, 24]
+    ka, ke = rng.uniform(1, 2, k), rng.uniform(0.1, 0.3, k)
+    t = np.asarray(times)
+    y = 100 * ka[:, None] / (ka - ke)[:, None] * (np.exp(-ke[:, None] * t) - np.exp(-ka[:, None] * t))
+    return times, (y * rng.lognormal(0, 0.05, y.shape)).tolist()
+
+
+@pytest.mark.parametrize("method", ["linear", "log-down"])
+def test_shared_axis_matches_reference(run, rng, method):
+    times, matrix = _pk(rng)
+    matrix[2][4] = None
+    out = run("timecourse-auc", shape="timecourse", times=times, matrix=matrix, method=method)
+    for row, got in zip(matrix, out["timecourse"]["series"]):
+        assert np.isclose(got["auc"], _series_auc(times, row, method == "log-down"), rtol=1e-12)
+    if method == "linear":
+        assert np.isclose(out["timecourse"]["series"][0]["auc"], np.trapezoid(matrix[0], times), rtol=1e-12)
+    else:
+        # Log-down only ever lowers a falling segment's area.
+        assert out["timecourse"]["series"][0]["auc"] < np.trapezoid(matrix[0], times)
+
+
+def test_ragged_axes_baselines_and_peaks(run):
+    times = [[0, 1, 2, 4], [2, 0, 1], [0, 3]]
+    matrix = [[5, 9, 7, 4], [6, 2, 8], [3, None]]
+    out = run("timecourse-auc", shape="timecourse", times=times, matrix=matrix, baseline="first")
+    s = out["timecourse"]["series"]
+    assert np.isclose(s[0]["auc"], _series_auc(times[0], matrix[0]))
+    assert np.isclose(s[1]["auc"], _series_auc(times[1], matrix[1]))
+    # Baseline is the first reading in time, not in the order sent.
+    assert s[1]["baseline"] == 2.0
+    assert np.isclose(s[1]["aucCorrected"], _series_auc(times[1], [v - 2 for v in matrix[1]]))
+    assert (s[0]["peak"], s[0]["timeToPeak"], s[0]["tEnd"]) == (9.0, 1.0, 4.0)
+    assert s[2]["auc"] is None and s[2]["points"] == 1
+    assert any("fewer than two readings" in w for w in out["warnings"])
+
+
+def test_min_and_fixed_baselines(run):
+    out = run("timecourse-auc", shape="timecourse", times=[0, 1, 2, 3], matrix=[[4, 1, 3, 2]],
+              baseline="min")
+    assert np.isclose(out["timecourse"]["series"][0]["aucCorrected"], _series_auc([0, 1, 2, 3], [3, 0, 2, 1]))
+    out = run("timecourse-auc", shape="timecourse", times=[0, 1, 2, 3], matrix=[[4, 1, 3, 2]], baseline=2)
+    # Net: the dip below the baseline counts against it.
+    assert np.isclose(out["timecourse"]["series"][0]["aucCorrected"], _series_auc([0, 1, 2, 3], [2, -1, 1, 0]))
+
+
+_REFERENCE = {
+    "t-unpaired": lambda *g: stats.ttest_ind(*g),
+    "t-welch": lambda *g: stats.ttest_ind(*g, equal_var=False),
+    "mann-whitney": lambda *g: stats.mannwhitneyu(*g, method="exact"),
+    "anova-one-way": stats.f_oneway,
+    "kruskal-wallis": stats.kruskal,
+}
+
+
+def test_every_comparison_has_a_reference(engine):
+    assert set(_REFERENCE) == set(engine._TIMECOURSE_COMPARISONS)
+
+
+@pytest.mark.parametrize("compare", sorted(_REFERENCE))
+def test_group_se_is_of_the_mean_auc_and_feeds_the_comparison(run, rng, compare):
+    k = 2 if compare in ("t-unpaired", "t-welch", "mann-whitney") else 3
+    times, matrix = _pk(rng, 5 * k)
+    groups = [g for g in "abc"[:k] for _ in range(5)]
+    out = run("timecourse-auc", shape="timecourse", times=times, matrix=matrix, seriesGroups=groups,
+              compareWith=compare)
+    tc = out["timecourse"]
+    assert tc["uncertainty"] == "group-mean"
+    aucs = np.array([_series_auc(times, r) for r in matrix]).reshape(k, 5)
+    for g, a in zip(tc["groups"], aucs):
+        assert np.isclose(g["meanAuc"], a.mean())
+        assert np.isclose(g["se"], stats.sem(a), rtol=1e-12)
+    ref = _REFERENCE[compare](*aucs)
+    assert np.isclose(out["test"]["statistic"], ref.statistic, rtol=1e-10)
+    assert np.isclose(out["test"]["pValue"], ref.pvalue, rtol=1e-10)
+    assert "SEM" in out["test"]["reportSentence"]
+
+
+def test_student_and_welch_differ_on_unequal_spreads(run, rng):
+    times, matrix = _pk(rng, 12)
+    matrix = [[v * (3 if i >= 4 else 1) for v in row] for i, row in enumerate(matrix)]
+    groups = ["a"] * 4 + ["b"] * 8
+    tests = [run("timecourse-auc", shape="timecourse", times=times, matrix=matrix, seriesGroups=groups,
+                 compareWith=c)["test"] for c in ("t-unpaired", "t-welch")]
+    assert [t["test"] for t in tests] == ["Unpaired t-test", "Welch's t-test"]
+    assert tests[0]["pValue"] != tests[1]["pValue"]
+
+
+@pytest.mark.parametrize("payload, message", [
+    ({"compareWith": "t-paired"}, "cannot compare"),
+    ({"compareWith": "t-welch"}, "needs seriesGroups"),
+    ({"compareWith": "t-welch", "seriesGroups": ["a", "b", "c"]}, "compares two groups; 3 have an AUC"),
+    ({"compareWith": "anova-one-way", "seriesGroups": ["a", "a", "a"]}, "two or more groups; 1 have"),
+])
+def test_unusable_comparison_is_an_error(run, payload, message):
+    out = run("timecourse-auc", shape="timecourse", times=[0, 1], matrix=[[1, 2], [2, 4], [3, 3]], **payload)
+    assert out["timecourse"] is None and out["error"]["code"] == "test-failed"
+    assert message in out["error"]["detail"]
@@ -30,12 +30,21 @@ import {
 // looked up per boot.
 const PYODIDE_BASE_URL = resolvePyodideBaseUrl(process.env.NEXT_PUBLIC_PYODIDE_BASE_URL)
 const ENGINE_SOURCE_URL = "/data-analysis-engine/notes9_engine.py"
+// Where the engine keeps its exact rank-test null tables. Mounted on IndexedDB,
+// so a table built in one session is read back in the next instead of rebuilt.
+const RANK_TABLE_DIR = "/notes9/rank-tables"
 
 type PyodideApi = {
   loadPackage: (names: string[] | string) => Promise<void>
   runPythonAsync: (code: string) => Promise<unknown>
   globals: { get: (name: string) => unknown; set: (name: string, value: unknown) => void }
   pyimport: (name: string) => { install: (pkgs: string[], opts?: Record<string, unknown>) => Promise<void> }
+  FS: {
+    mkdirTree: (path: string) => void
+    mount: (type: unknown, opts: Record<string, unknown>, mountpoint: string) => void
+    syncfs: (populate: boolean, callback: (err: unknown) => void) => void
+    filesystems: { IDBFS: unknown }
+  }
 }
 
 declare const self: DedicatedWorkerGlobalScope & {
@@ -121,6 +130,7 @@ function bootPyodide(id: string): Promise<PyodideApi> {
     })
     // Define the module once; each compute call then only invokes run().
     await pyodide.runPythonAsync(source)
+    await mountRankTables(pyodide)
 
     post({ id, type: "ready", engineVersion: ENGINE_VERSION })
     return pyodide
@@ -134,6 +144,25 @@ function bootPyodide(id: string): Promise<PyodideApi> {
   return pyodidePromise
 }
 
+function syncfs(pyodide: PyodideApi, populate: boolean): Promise<void> {
+  return new Promise((resolve, reject) =>
+    pyodide.FS.syncfs(populate, (err) => (err ? reject(err) : resolve()))
+  )
+}
+
+// Best effort throughout: without IndexedDB (private browsing, a full quota)
+// the engine keeps its tables in memory for the session, as it would anyway.
+async function mountRankTables(pyodide: PyodideApi) {
+  try {
+    pyodide.FS.mkdirTree(RANK_TABLE_DIR)
+    pyodide.FS.mount(pyodide.FS.filesystems.IDBFS, {}, RANK_TABLE_DIR)
+    await syncfs(pyodide, true)
+    pyodide.globals.set("RANK_TABLE_DIR", RANK_TABLE_DIR)
+  } catch {
+    // Leave RANK_TABLE_DIR as None.
+  }
+}
+
 self.onmessage = async (event: MessageEvent<WorkerRequest>) => {
   const { id, type } = event.data
   try {
@@ -152,6 +181,8 @@ self.onmessage = async (event: MessageEvent<WorkerRequest>) => {
       "import json; json.dumps(run(json.loads(__n9_payload_json)))"
     )
     post({ id, type: "result", result: JSON.parse(String(raw)) })
+    // Write out any table this run built; the result is already on its way.
+    if (pyodide.globals.get("RANK_TABLE_DIR") != null) syncfs(pyodide, false).catch(() => {})
   } catch (err) {
     post({ id, type: "error", message: err instanceof Error ? err.message : String(err) })
   }
@@ -243,6 +243,7 @@ export const EFFECT_LABEL: Record<string, string> = {
   "pearson-r": "r",
   "spearman-rho": "ρ",
   "r-squared": "R²",
+  "hodges-lehmann": "Hodges-Lehmann shift",
 }
 
 /**
@@ -207,9 +207,9 @@ export function buildResultsSheet(
 
     if (f.interpolated && f.interpolated.length > 0) {
       section("Interpolated unknowns")
-      rows.push(["Label", "Signal", "Concentration", "Within standard range"])
+      rows.push(["Label", "Signal", "Concentration", "CI low", "CI high", "Within standard range"])
       for (const u of f.interpolated) {
-        rows.push([u.label, u.signal, u.concentration, u.inRange ? "yes" : "no"])
+        rows.push([u.label, u.signal, u.concentration, u.ciLow ?? null, u.ciHigh ?? null, u.inRange ? "yes" : "no"])
       }
     }
   }
@@ -1,84 +1,240 @@
 #!/usr/bin/env python3
 """
-Remove opaque checkerboard / square backdrop from notes9-mascot.png via edge flood-fill.
-Inner whites stay opaque (sealed by the black circular ring).
+Build the mascot's UI assets: backdrop removed, at every size and format the UI draws.
+
+    python3 scripts/utilities/build-mascot-transparent.py
+    python3 scripts/utilities/build-mascot-transparent.py --sizes 256,128 --formats webp -j 4
+
+Needs Pillow, NumPy and SciPy (pip install pillow numpy scipy).
+
+Removes the opaque checkerboard / square backdrop from each source via edge
+flood-fill; inner whites stay opaque (sealed by the black circular ring). The
+flood fill is a connected-component labelling of the non-barrier pixels,
+keeping the components that touch the border, which is the same set a
+4-connected BFS seeded from the border reaches.
+
+Each source is decoded and cleaned once, then resized and encoded to every
+configured size and format. The UI draws only the full-size PNG today, so that
+is all an asset declares; smaller sizes and WebP are there for a component that
+references them, via --sizes/--formats or the asset's own lists. The full-size
+PNG keeps its old name, and every output keeps the source's colour profile,
+resolution and EXIF block.
+
+public/mascot-assets.json records, per source, the hash of its content, the
+hash of the build settings (sizes, formats, encoder options, this script,
+Pillow's version) and the hash of every output. A source whose hashes all
+match is skipped, and stale sources are built in parallel, one per process.
 """
 from __future__ import annotations
 
-from collections import deque
+import argparse
+import hashlib
+import io
+import json
+import multiprocessing
+import sys
 from pathlib import Path
+from typing import NamedTuple
 
+import numpy as np
+import PIL
 from PIL import Image
+from scipy import ndimage
+
+ROOT = Path(__file__).resolve().parents[2]
+MANIFEST = ROOT / "public" / "mascot-assets.json"
+
+
+class Asset(NamedTuple):
+    # Paths are relative to the repo root; `stem` is the output path without its
+    # extension. Sizes are the longest edge in px, 0 meaning the source's own
+    # size; a size at or above the source's is skipped rather than upscaled.
+    source: str
+    stem: str
+    sizes: tuple[int, ...]
+    formats: tuple[str, ...]
+
+
+ASSETS = (
+    Asset("public/notes9-mascot.png", "public/notes9-mascot-ui", (0,), ("png",)),
+)
+
+_ENCODE = {
+    "png": {"format": "PNG", "optimize": True},
+    "webp": {"format": "WEBP", "quality": 90, "method": 4},
+}
+
+
+# 4-connectivity, as the BFS stepped: no diagonals, so a one-pixel-wide
+# diagonal gap in the ring does not leak the flood inside.
+_CROSS = np.array([[0, 1, 0], [1, 1, 1], [0, 1, 0]], dtype=bool)
+
+
+def make_transparent(rgba: np.ndarray) -> tuple[np.ndarray, int, int]:
+    """Clear the border-connected backdrop, flatten inner checkerboard; returns (rgba, cleared, flattened)."""
+    out = np.ascontiguousarray(rgba).copy()
+    r, g, b, a = (out[..., i] for i in range(4))
+    # Channel sums in uint16 (uint8 would wrap), compared against 3x the old
+    # thresholds so the float means' decisions hold exactly.
+    total = r.astype(np.uint16) + g + b
+    # One uint32 per pixel, so clearing and flattening are single-word writes.
+    pixels = out.view(np.uint32)[..., 0]
+
+    # Thick black strokes / ring block the flood into the logo interior
+    barrier = (a >= 200) & (total < 3 * 95)
+    labels, count = ndimage.label(~barrier, structure=_CROSS)
+    reached = np.zeros(count + 1, dtype=bool)
+    reached[labels[0]] = reached[labels[-1]] = True
+    reached[labels[:, 0]] = reached[labels[:, -1]] = True
+    reached[0] = False  # label 0 is the barrier itself
+    seen = reached[labels]
+    pixels[seen] = 0
+    cleared = int(np.count_nonzero(seen))
 
+    # Inner “transparency” checkerboard is still opaque inside the ring, flatten to paper white
+    sat = np.maximum(np.maximum(r, g), b) - np.minimum(np.minimum(r, g), b)
+    flat = (a >= 128) & (sat < 38) & (total > 3 * 148)
+    pixels[flat] = 0xFFFFFFFF
+    return out, cleared, int(np.count_nonzero(flat))
 
-def main() -> None:
-    root = Path(__file__).resolve().parents[2]
-    src = root / "public" / "notes9-mascot.png"
-    out = root / "public" / "notes9-mascot-ui.png"
 
-    img = Image.open(src).convert("RGBA")
-    px = img.load()
-    w, h = img.size
+# Source metadata written back into every output. Image.fromarray starts from
+# an empty info dict, so without this a tagged source would come out untagged
+# and be drawn in sRGB, and a 300 dpi one at 72.
+_CARRIED = ("icc_profile", "dpi", "exif")
 
-    def lum_at(x: int, y: int) -> float:
-        r, g, b, _ = px[x, y]
-        return (r + g + b) / 3.0
-
-    def is_barrier(x: int, y: int) -> bool:
-        r, g, b, a = px[x, y]
-        if a < 200:
-            return False
-        # Thick black strokes / ring block the flood into the logo interior
-        return (r + g + b) / 3 < 95
-
-    seen = [[False] * h for _ in range(w)]
-    q: deque[tuple[int, int]] = deque()
-
-    def push(x: int, y: int) -> None:
-        if x < 0 or y < 0 or x >= w or y >= h or seen[x][y] or is_barrier(x, y):
-            return
-        seen[x][y] = True
-        q.append((x, y))
-
-    for x in range(w):
-        push(x, 0)
-        push(x, h - 1)
-    for y in range(h):
-        push(0, y)
-        push(w - 1, y)
-
-    while q:
-        x, y = q.popleft()
-        for nx, ny in ((x + 1, y), (x - 1, y), (x, y + 1), (x, y - 1)):
-            if 0 <= nx < w and 0 <= ny < h and not seen[nx][ny] and not is_barrier(nx, ny):
-                seen[nx][ny] = True
-                q.append((nx, ny))
-
-    cleared = 0
-    for x in range(w):
-        for y in range(h):
-            if seen[x][y]:
-                px[x, y] = (0, 0, 0, 0)
-                cleared += 1
 
-    # Inner “transparency” checkerboard is still opaque inside the ring, flatten to paper white
-    flattened = 0
-    for x in range(w):
-        for y in range(h):
-            r, g, b, a = px[x, y]
-            if a < 128:
-                continue
-            lum = (r + g + b) / 3.0
-            sat = max(r, g, b) - min(r, g, b)
-            if sat < 38 and lum > 148:
-                px[x, y] = (255, 255, 255, 255)
-                flattened += 1
-
-    img.save(out, optimize=True)
-    print(
-        f"Wrote {out} ({w}x{h}), edge-cleared {cleared} px, inner-flattened {flattened} px"
-    )
+def _metadata(info: dict) -> dict:
+    return {key: info[key] for key in _CARRIED if info.get(key)}
+
+
+def _sha256(data: bytes) -> str:
+    return hashlib.sha256(data).hexdigest()
+
+
+def settings_hash(asset: Asset) -> str:
+    """What an output is only valid for besides its source: how it was made."""
+    settings = {
+        "stem": asset.stem, "sizes": sorted(asset.sizes), "formats": sorted(asset.formats),
+        "encode": {f: _ENCODE[f] for f in asset.formats},
+        "script": _sha256(Path(__file__).read_bytes()), "pillow": PIL.__version__,
+    }
+    return _sha256(json.dumps(settings, sort_keys=True).encode())
+
+
+def output_path(stem: str, size: int, fmt: str) -> str:
+    return f"{stem}{f'-{size}' if size else ''}.{fmt}"
+
+
+def _resized(img: Image.Image, size: int) -> Image.Image:
+    w, h = img.size
+    scale = size / max(w, h)
+    dims = (max(1, round(w * scale)), max(1, round(h * scale)))
+    # Premultiplied, so the cleared pixels' black does not bleed into the edge
+    # of the mascot as a dark fringe.
+    return img.convert("RGBa").resize(dims, Image.LANCZOS).convert("RGBA")
+
+
+def build(asset: Asset) -> tuple[Asset, dict, str]:
+    """Decode once, clean once, write every size x format; returns the manifest entry."""
+    src = ROOT / asset.source
+    data = src.read_bytes()
+    img = Image.open(io.BytesIO(data)).convert("RGBA")
+    w, h = img.size
+    rgba, cleared, flattened = make_transparent(np.asarray(img))
+    full = Image.fromarray(rgba, "RGBA")
+    metadata = _metadata(img.info)
+
+    outputs = {}
+    for size in sorted(set(asset.sizes), reverse=True):
+        if size and size >= max(w, h):
+            continue
+        frame = _resized(full, size) if size else full
+        for fmt in asset.formats:
+            rel = output_path(asset.stem, size, fmt)
+            frame.save(ROOT / rel, **_ENCODE[fmt], **metadata)
+            outputs[rel] = _sha256((ROOT / rel).read_bytes())
+
+    entry = {"source": _sha256(data), "settings": settings_hash(asset), "outputs": outputs}
+    note = (f"Wrote {len(outputs)} file(s) from {src} ({w}x{h}), "
+            f"edge-cleared {cleared} px, inner-flattened {flattened} px")
+    return asset, entry, note
+
+
+def _fresh(asset: Asset, entry: dict | None) -> bool:
+    if not entry:
+        return False
+    if entry.get("source") != _sha256((ROOT / asset.source).read_bytes()):
+        return False
+    if entry.get("settings") != settings_hash(asset):
+        return False
+    # An output deleted or edited by hand is rebuilt, not trusted.
+    return all((ROOT / rel).is_file() and _sha256((ROOT / rel).read_bytes()) == digest
+               for rel, digest in entry.get("outputs", {}).items())
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0].strip())
+    parser.add_argument("--sizes", help="comma-separated longest edges in px, 0 for full size "
+                                        "(default: each asset's own list)")
+    parser.add_argument("--formats", help=f"comma-separated, from {', '.join(_ENCODE)} "
+                                          "(default: each asset's own list)")
+    parser.add_argument("-j", "--workers", type=int, default=multiprocessing.cpu_count(),
+                        help="worker processes (default: one per core; 1 runs inline)")
+    parser.add_argument("--force", action="store_true", help="rebuild even when up to date")
+    args = parser.parse_args(argv)
+
+    assets = list(ASSETS)
+    if args.sizes:
+        sizes = tuple(int(s) for s in args.sizes.split(","))
+        assets = [a._replace(sizes=sizes) for a in assets]
+    if args.formats:
+        formats = tuple(f.strip().lower() for f in args.formats.split(","))
+        unknown = [f for f in formats if f not in _ENCODE]
+        if unknown:
+            parser.error(f"unknown format(s): {', '.join(unknown)}")
+        assets = [a._replace(formats=formats) for a in assets]
+
+    missing = [a.source for a in assets if not (ROOT / a.source).is_file()]
+    if missing:
+        print(f"Missing source(s): {', '.join(missing)}", file=sys.stderr)
+        return 1
+
+    manifest = json.loads(MANIFEST.read_text()) if MANIFEST.is_file() else {}
+    stale = []
+    for asset in assets:
+        if not args.force and _fresh(asset, manifest.get(asset.source)):
+            print(f"Up to date: {asset.source}")
+        else:
+            stale.append(asset)
+
+    if len(stale) > 1 and args.workers > 1:
+        with multiprocessing.Pool(min(args.workers, len(stale))) as pool:
+            built = pool.map(build, stale)
+    else:
+        built = [build(a) for a in stale]
+
+    declared = {a.source: a for a in ASSETS}
+    for asset, entry, note in built:
+        # Outputs the previous settings wrote and these no longer do, e.g. a
+        # dropped size, would otherwise linger in public/ and keep being served.
+        # What the asset itself declares is never removed, so a one-off
+        # --sizes/--formats run cannot delete a file the UI loads (the
+        # full-size PNG above all, which is tracked in git).
+        own = declared[asset.source]
+        keep = set(entry["outputs"]) | {output_path(own.stem, 0, "png")}
+        keep |= {output_path(own.stem, size, fmt) for size in own.sizes for fmt in own.formats}
+        for rel in set(manifest.get(asset.source, {}).get("outputs", {})) - keep:
+            (ROOT / rel).unlink(missing_ok=True)
+        manifest[asset.source] = entry
+        print(note)
+
+    if built:
+        tmp = MANIFEST.with_suffix(".json.tmp")
+        tmp.write_text(json.dumps(manifest, indent=2, sort_keys=True) + "\n")
+        tmp.replace(MANIFEST)
+    return 0
 
 
 if __name__ == "__main__":
-    main()
+    sys.exit(main())
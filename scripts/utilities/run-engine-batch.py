@@ -0,0 +1,300 @@
+#!/usr/bin/env python3
+"""
+Run the notes9-stats engine over a stream of payloads on native CPython.
+
+    python3 scripts/utilities/run-engine-batch.py payloads.jsonl -o results.jsonl
+    cat payloads.jsonl | python3 scripts/utilities/run-engine-batch.py - --workers 8
+
+For re-validating saved analyses in bulk, e.g. after a dataset correction, which
+is thousands of payloads that should not queue behind a browser tab. Each input
+line is one resolver payload, exactly what the worker hands `run()`; each output
+line is the engine's answer for it, in input order, with the time it took.
+
+The engine source is loaded from public/data-analysis-engine/notes9_engine.py,
+the same file the Pyodide worker fetches, so there is one engine and not a
+server-side copy of it. Its numbers match the browser's only when the numpy,
+scipy and statsmodels versions match the Pyodide lock, which is why those
+versions are printed with the summary.
+
+With --store, results persist in a single SQLite file keyed by a hash of the
+canonical payload and of the engine itself, so a re-run only computes what
+changed. run() is a pure function of its payload, which is what makes that
+sound; the engine half of the key is the source file's own hash plus the
+package versions, so editing the engine invalidates every entry without anyone
+remembering to bump a number.
+"""
+from __future__ import annotations
+
+import argparse
+import hashlib
+import importlib.util
+import json
+import multiprocessing
+import sqlite3
+import sys
+import threading
+import time
+from pathlib import Path
+from typing import Iterable, Iterator
+
+ENGINE_SOURCE = (
+    Path(__file__).resolve().parents[2] / "public" / "data-analysis-engine" / "notes9_engine.py"
+)
+
+_engine = None
+
+
+def load_engine():
+    spec = importlib.util.spec_from_file_location("notes9_engine", ENGINE_SOURCE)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+def _init_worker() -> None:
+    # Once per process, not per payload: importing scipy and statsmodels costs
+    # far more than most analyses do.
+    global _engine
+    _engine = load_engine()
+
+
+def engine_fingerprint() -> str:
+    """What a stored result is only valid for: this engine source, these packages."""
+    digest = hashlib.sha256(ENGINE_SOURCE.read_bytes())
+    digest.update(_package_versions().encode())
+    return digest.hexdigest()
+
+
+def payload_key(payload: dict, fingerprint: str) -> str:
+    # Sorted keys and fixed separators, so two payloads that differ only in key
+    # order or whitespace share an entry.
+    canonical = json.dumps(payload, sort_keys=True, separators=(",", ":"), ensure_ascii=False)
+    return hashlib.sha256(f"{fingerprint}|{canonical}".encode()).hexdigest()
+
+
+class ResultStore:
+    """
+    Content-addressed results in one SQLite file, bounded in size.
+
+    Eviction is least-recently-used by total stored bytes. Entries written by a
+    different engine fingerprint can never be hit again, so they are dropped on
+    open rather than left to age out.
+
+    Lookups happen on the pool's task-feeding thread and inserts on the main
+    one, hence the shared connection behind a lock.
+    """
+
+    def __init__(self, path: str, fingerprint: str, max_bytes: int):
+        self.db = sqlite3.connect(path, check_same_thread=False)
+        self.lock = threading.Lock()
+        self.db.execute(
+            "CREATE TABLE IF NOT EXISTS results (key TEXT PRIMARY KEY, engine TEXT NOT NULL, "
+            "result TEXT NOT NULL, bytes INTEGER NOT NULL, used REAL NOT NULL)")
+        self.db.execute("CREATE INDEX IF NOT EXISTS results_used ON results (used)")
+        self.max_bytes = max_bytes
+        self.hits = self.misses = self.evicted = 0
+        self.evicted += self.db.execute("DELETE FROM results WHERE engine != ?", (fingerprint,)).rowcount
+        self.fingerprint = fingerprint
+        self.size = self.db.execute("SELECT COALESCE(SUM(bytes), 0) FROM results").fetchone()[0]
+        if self.size > self.max_bytes:
+            self._evict()
+        self.db.commit()
+
+    def get(self, key: str) -> str | None:
+        with self.lock:
+            row = self.db.execute("SELECT result FROM results WHERE key = ?", (key,)).fetchone()
+            if row is None:
+                self.misses += 1
+                return None
+            self.hits += 1
+            self.db.execute("UPDATE results SET used = ? WHERE key = ?", (time.time(), key))
+            return row[0]
+
+    def put(self, key: str, result: str) -> None:
+        size = len(result.encode())
+        if size > self.max_bytes:
+            return
+        with self.lock:
+            old = self.db.execute("SELECT bytes FROM results WHERE key = ?", (key,)).fetchone()
+            self.db.execute("INSERT OR REPLACE INTO results VALUES (?, ?, ?, ?, ?)",
+                            (key, self.fingerprint, result, size, time.time()))
+            self.size += size - (old[0] if old else 0)
+            if self.size > self.max_bytes:
+                self._evict()
+
+    def _evict(self) -> None:
+        # Down to 90% rather than to the line, so a full store does not pay an
+        # eviction query on every single insert.
+        target = self.max_bytes * 0.9
+        rows = self.db.execute("SELECT key, bytes FROM results ORDER BY used").fetchall()
+        doomed = []
+        for key, size in rows:
+            if self.size <= target:
+                break
+            doomed.append((key,))
+            self.size -= size
+        self.db.executemany("DELETE FROM results WHERE key = ?", doomed)
+        self.evicted += len(doomed)
+
+    def close(self) -> None:
+        with self.lock:
+            self.db.commit()
+            self.db.close()
+
+
+def _record(line_no: int, result: str | None, error: dict | None, elapsed_ms: float,
+            cached: bool) -> str:
+    # Composed around the already-serialised result so a stored entry is
+    # written back out without a parse and re-dump.
+    return (f'{{"line": {line_no}, "result": {result if result is not None else "null"}, '
+            f'"error": {json.dumps(error)}, "elapsedMs": {round(elapsed_ms, 3)}, '
+            f'"cached": {"true" if cached else "false"}}}')
+
+
+def _parse(line: str) -> tuple[dict | None, dict | None]:
+    try:
+        payload = json.loads(line)
+    except json.JSONDecodeError as exc:
+        return None, {"code": "invalid-json", "message": str(exc)}
+    if not isinstance(payload, dict):
+        return None, {"code": "invalid-payload", "message": "Each line must be a JSON object."}
+    return payload, None
+
+
+def _run_line(item: tuple) -> tuple[bool, str, str | None, str | None]:
+    """
+    One payload in; out come whether it failed, its output record, and the
+    serialised result with its store key when there is one to keep. Parsing and
+    serialising happen here so the parent process only moves strings.
+    """
+    kind, line_no, body, key = item
+    started = time.perf_counter()
+    if kind == "hit":
+        return False, _record(line_no, body, None, 0.0, True), None, None
+    if kind == "invalid":
+        return True, _record(line_no, None, body, 0.0, False), None, None
+    if isinstance(body, str):
+        body, error = _parse(body)
+        if error is not None:
+            return True, _record(line_no, None, error, 0.0, False), None, None
+    try:
+        out = _engine.run(body)
+        result = json.dumps(out, allow_nan=False)
+    except Exception as exc:
+        # One payload the engine chokes on must cost its own line, not the
+        # rest of the batch: an exception here would end pool.imap mid-stream.
+        error = {"code": "engine-exception", "message": f"{type(exc).__name__}: {exc}"}
+        elapsed = (time.perf_counter() - started) * 1000
+        return True, _record(line_no, None, error, elapsed, False), None, None
+    elapsed = (time.perf_counter() - started) * 1000
+    return out.get("error") is not None, _record(line_no, result, None, elapsed, False), result, key
+
+
+def read_payloads(stream: Iterable[str], store: ResultStore | None = None) -> Iterator[tuple]:
+    """
+    Lazily, so a million-line file is never held in memory at once. With a store
+    each payload is parsed here to key it, and a hit is answered without the
+    engine running.
+    """
+    for line_no, line in enumerate(stream, start=1):
+        if not line.strip():
+            continue
+        if store is None:
+            yield "run", line_no, line, None
+            continue
+        payload, error = _parse(line)
+        if error is not None:
+            yield "invalid", line_no, error, None
+            continue
+        key = payload_key(payload, store.fingerprint)
+        cached = store.get(key)
+        if cached is not None:
+            yield "hit", line_no, cached, None
+        else:
+            yield "run", line_no, payload, key
+
+
+def run_batch(stream: Iterable[str], out, workers: int, chunksize: int,
+              store: ResultStore | None = None) -> dict:
+    items = read_payloads(stream, store)
+    count = failed = 0
+    started = time.perf_counter()
+
+    def emit(rows: Iterable[tuple[bool, str, str | None, str | None]]) -> None:
+        nonlocal count, failed
+        for bad, row, result, key in rows:
+            out.write(row + "\n")
+            count += 1
+            failed += bad
+            # Failures are not kept: they are cheap to reproduce, and one caused
+            # by the environment (statsmodels missing, say) must not outlive it.
+            if store is not None and key is not None and not bad:
+                store.put(key, result)
+
+    if workers <= 1:
+        _init_worker()
+        emit(_run_line(item) for item in items)
+    else:
+        with multiprocessing.Pool(workers, initializer=_init_worker) as pool:
+            # imap, not map: it keeps input order and streams, dispatching
+            # `chunksize` payloads per round trip so IPC does not dominate the
+            # many analyses that finish in a millisecond.
+            emit(pool.imap(_run_line, items, chunksize=chunksize))
+
+    return {"payloads": count, "failed": failed,
+            "seconds": round(time.perf_counter() - started, 3)}
+
+
+def _package_versions() -> str:
+    versions = []
+    for name in ("numpy", "scipy", "statsmodels"):
+        try:
+            versions.append(f"{name} {__import__(name).__version__}")
+        except ImportError:
+            versions.append(f"{name} missing")
+    return ", ".join(versions)
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0].strip())
+    parser.add_argument("input", help="JSONL file of payloads, or - for stdin")
+    parser.add_argument("-o", "--output", help="where to write results (default: stdout)")
+    parser.add_argument("-j", "--workers", type=int, default=multiprocessing.cpu_count(),
+                        help="worker processes (default: one per core; 1 runs inline)")
+    parser.add_argument("--chunksize", type=int, default=16,
+                        help="payloads dispatched to a worker per round trip (default: 16)")
+    parser.add_argument("--store", help="SQLite result store to read from and write to")
+    parser.add_argument("--store-max-mb", type=float, default=512,
+                        help="size bound for the store before LRU eviction (default: 512)")
+    args = parser.parse_args(argv)
+
+    store = (ResultStore(args.store, engine_fingerprint(), int(args.store_max_mb * 1024 * 1024))
+             if args.store else None)
+    source = sys.stdin if args.input == "-" else open(args.input, encoding="utf-8")
+    out = sys.stdout if not args.output else open(args.output, "w", encoding="utf-8")
+    try:
+        summary = run_batch(source, out, max(1, args.workers), max(1, args.chunksize), store)
+    finally:
+        if source is not sys.stdin:
+            source.close()
+        if out is not sys.stdout:
+            out.close()
+        if store is not None:
+            store.close()
+
+    print(
+        f"Ran {summary['payloads']} payload(s) in {summary['seconds']}s, "
+        f"{summary['failed']} failed ({_package_versions()})",
+        file=sys.stderr,
+    )
+    if store is not None:
+        print(
+            f"Store: {store.hits} hit(s), {store.misses} miss(es), {store.evicted} evicted, "
+            f"{store.size / (1024 * 1024):.1f} MB held",
+            file=sys.stderr,
+        )
+    return 1 if summary["failed"] else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,35 @@
+"""
+Shared fixtures for the scripts/utilities tests.
+
+The utilities are scripts with hyphenated names, not modules, so they are
+loaded from their paths here.
+
+    python -m pytest scripts/utilities/tests
+"""
+from __future__ import annotations
+
+import importlib.util
+import sys
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+UTILITIES = Path(__file__).resolve().parents[1]
+
+
+@pytest.fixture(scope="session")
+def load_script():
+    def load(filename: str, name: str):
+        spec = importlib.util.spec_from_file_location(name, UTILITIES / filename)
+        module = importlib.util.module_from_spec(spec)
+        # Registered, so a worker pool can pickle the module's functions by name.
+        sys.modules[name] = module
+        spec.loader.exec_module(module)
+        return module
+    return load
+
+
+@pytest.fixture
+def rng():
+    return np.random.default_rng(20240611)
@@ -0,0 +1,97 @@
+"""
+The mascot asset build (scripts/utilities/build-mascot-transparent.py): the
+flood fill clears what a border-seeded 4-connected BFS reaches, every output
+keeps the source's colour profile and resolution, and a one-off size/format
+selection never deletes what the asset declares.
+"""
+from collections import deque
+
+import numpy as np
+import pytest
+from PIL import Image, ImageCms
+
+
+@pytest.fixture(scope="module")
+def mascot(load_script):
+    return load_script("build-mascot-transparent.py", "build_mascot_transparent")
+
+
+def _bfs_reach(barrier: np.ndarray) -> np.ndarray:
+    h, w = barrier.shape
+    seen = np.zeros_like(barrier)
+    q = deque()
+    for y in range(h):
+        for x in range(w):
+            if (y in (0, h - 1) or x in (0, w - 1)) and not barrier[y, x]:
+                seen[y, x] = True
+                q.append((y, x))
+    while q:
+        y, x = q.popleft()
+        for ny, nx in ((y + 1, x), (y - 1, x), (y, x + 1), (y, x - 1)):
+            if 0 <= ny < h and 0 <= nx < w and not seen[ny, nx] and not barrier[ny, nx]:
+                seen[ny, nx] = True
+                q.append((ny, nx))
+    return seen
+
+
+def _ringed(rng, size=64):
+    """Checkerboard backdrop, a black ring with a diagonal one-pixel gap, noise inside."""
+    yy, xx = np.mgrid[:size, :size]
+    rgba = np.full((size, size, 4), 255, dtype=np.uint8)
+    rgba[..., :3] = np.where(((yy // 4 + xx // 4) % 2)[..., None], 200, 245)
+    d = np.hypot(yy - size / 2, xx - size / 2)
+    inside = d < size / 3 - 2
+    rgba[inside, :3] = rng.integers(0, 256, size=(int(inside.sum()), 3))
+    ring = (d >= size / 3 - 2) & (d < size / 3)
+    rgba[ring, :3] = 10
+    rgba[size // 2, size // 2 + size // 3 - 1, :3] = 250
+    return rgba
+
+
+def test_flood_fill_is_the_bfs_reach(mascot, rng):
+    rgba = _ringed(rng)
+    out, cleared, flattened = mascot.make_transparent(rgba)
+    rgb = rgba[..., :3].astype(int)
+    reach = _bfs_reach((rgba[..., 3] >= 200) & (rgb.sum(-1) / 3 < 95))
+    np.testing.assert_array_equal((out == 0).all(-1), reach)
+    assert cleared == reach.sum()
+    # The original per-pixel rule for the inner checkerboard, on what the flood left.
+    flat = ~reach & (rgba[..., 3] >= 128) & (np.ptp(rgb, axis=-1) < 38) & (rgb.sum(-1) / 3 > 148)
+    assert flattened == flat.sum()
+    assert (out[flat] == 255).all()
+    np.testing.assert_array_equal(out[~reach & ~flat], rgba[~reach & ~flat])
+
+
+def test_outputs_keep_profile_and_resolution(mascot, rng, tmp_path, monkeypatch):
+    monkeypatch.setattr(mascot, "ROOT", tmp_path)
+    icc = ImageCms.ImageCmsProfile(ImageCms.createProfile("sRGB")).tobytes()
+    (tmp_path / "public").mkdir()
+    Image.fromarray(_ringed(rng), "RGBA").save(tmp_path / "public" / "m.png", icc_profile=icc, dpi=(300, 300))
+    asset = mascot.Asset("public/m.png", "public/m-ui", (0, 32), ("png", "webp"))
+    _, entry, _ = mascot.build(asset)
+    assert sorted(entry["outputs"]) == ["public/m-ui-32.png", "public/m-ui-32.webp",
+                                        "public/m-ui.png", "public/m-ui.webp"]
+    for rel in entry["outputs"]:
+        with Image.open(tmp_path / rel) as im:
+            assert im.info.get("icc_profile") == icc, rel
+            if rel.endswith(".png"):
+                assert tuple(round(v) for v in im.info["dpi"]) == (300, 300), rel
+
+
+def test_selection_runs_never_delete_declared_outputs(mascot, rng, tmp_path, monkeypatch):
+    monkeypatch.setattr(mascot, "ROOT", tmp_path)
+    monkeypatch.setattr(mascot, "MANIFEST", tmp_path / "public" / "assets.json")
+    monkeypatch.setattr(mascot, "ASSETS", (mascot.Asset("public/m.png", "public/m-ui", (0, 32), ("png",)),))
+    (tmp_path / "public").mkdir()
+    Image.fromarray(_ringed(rng), "RGBA").save(tmp_path / "public" / "m.png")
+    files = lambda: sorted(p.name for p in (tmp_path / "public").glob("m-ui*"))
+
+    assert mascot.main(["-j", "1"]) == 0
+    assert files() == ["m-ui-32.png", "m-ui.png"]
+    assert mascot.main(["--sizes", "16", "--formats", "webp", "-j", "1"]) == 0
+    assert files() == ["m-ui-16.webp", "m-ui-32.png", "m-ui.png"]
+    # A later selection drops the earlier one's files, and only those.
+    assert mascot.main(["--sizes", "8", "--formats", "webp", "-j", "1"]) == 0
+    assert files() == ["m-ui-32.png", "m-ui-8.webp", "m-ui.png"]
+    assert mascot.main(["-j", "1"]) == 0
+    assert files() == ["m-ui-32.png", "m-ui.png"]
@@ -0,0 +1,92 @@
+"""
+The CPython batch runner (scripts/utilities/run-engine-batch.py): input order
+kept, a bad line costs only itself, and the result store answers repeats
+without running the engine and never serves an entry from another engine.
+"""
+import io
+import json
+
+import pytest
+
+
+@pytest.fixture(scope="module")
+def batch(load_script):
+    return load_script("run-engine-batch.py", "run_engine_batch")
+
+
+LINES = [
+    '{"test": "descriptives", "shape": "columns", "columns": {"a": [1, 2, 3]}}',
+    "not json",
+    "[1, 2]",
+    # run() raises on this one: `warnings` must be a list.
+    '{"test": "none", "warnings": 5}',
+    '{"test": "descriptives", "shape": "columns", "columns": {"a": [4, 5]}}',
+]
+
+
+def _records(out: io.StringIO) -> list:
+    return [json.loads(line) for line in out.getvalue().splitlines()]
+
+
+def test_every_line_answered_in_order_and_failures_contained(batch):
+    out = io.StringIO()
+    summary = batch.run_batch(iter(line + "\n" for line in LINES), out, workers=1, chunksize=2)
+    rows = _records(out)
+    assert [r["line"] for r in rows] == [1, 2, 3, 4, 5]
+    assert [r["error"] and r["error"]["code"] for r in rows] == [
+        None, "invalid-json", "invalid-payload", "engine-exception", None]
+    assert rows[0]["result"]["descriptives"][0]["mean"] == 2.0
+    assert rows[4]["result"]["descriptives"][0]["mean"] == 4.5
+    assert summary["payloads"] == 5 and summary["failed"] == 3
+
+
+def test_worker_pool_matches_inline(batch):
+    inline, pooled = io.StringIO(), io.StringIO()
+    batch.run_batch(iter(LINES), inline, workers=1, chunksize=1)
+    batch.run_batch(iter(LINES), pooled, workers=2, chunksize=1)
+
+    def timeless(out):
+        rows = _records(out)
+        for r in rows:
+            r.pop("elapsedMs")
+            if r["result"]:
+                r["result"].pop("durationMs")
+        return rows
+    assert timeless(inline) == timeless(pooled)
+
+
+def test_store_hits_repeats_and_drops_other_engines(batch, tmp_path):
+    path = str(tmp_path / "store.sqlite")
+    good = [LINES[0], LINES[4], LINES[3]]
+
+    store = batch.ResultStore(path, "engine-a", 1 << 20)
+    batch.run_batch(iter(good), io.StringIO(), workers=1, chunksize=1, store=store)
+    assert (store.hits, store.misses) == (0, 3)
+    store.close()
+
+    store = batch.ResultStore(path, "engine-a", 1 << 20)
+    out = io.StringIO()
+    batch.run_batch(iter(good), out, workers=1, chunksize=1, store=store)
+    # The engine exception is not stored, so it is recomputed, not served.
+    assert (store.hits, store.misses) == (2, 1)
+    assert [r["cached"] for r in _records(out)] == [True, True, False]
+    store.close()
+
+    store = batch.ResultStore(path, "engine-b", 1 << 20)
+    assert store.evicted == 2 and store.size == 0
+    store.close()
+
+
+def test_payload_key_ignores_key_order(batch):
+    a = batch.payload_key({"test": "none", "columns": {"a": [1]}}, "f")
+    b = batch.payload_key({"columns": {"a": [1]}, "test": "none"}, "f")
+    assert a == b != batch.payload_key({"test": "none", "columns": {"a": [2]}}, "f")
+
+
+def test_store_evicts_least_recently_used_past_its_bound(batch, tmp_path):
+    store = batch.ResultStore(str(tmp_path / "s.sqlite"), "f", 1000)
+    for i in range(5):
+        store.put(f"k{i}", "x" * 300)
+    assert store.size <= 1000 and store.evicted > 0
+    assert store.get("k4") is not None and store.get("k0") is None
+    store.close()